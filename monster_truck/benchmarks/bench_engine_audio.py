@@ -0,0 +1,72 @@
+"""
+Time each truck's engine bank, built from its recorded loops and loaded from
+the bank cache, and the per-frame cost of EngineAudio.step while the engine
+speed sweeps across the bank with the throttle toggling.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_engine_audio
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from monster_truck.configs.trucks import TRUCKS
+from monster_truck.engine_audio import EngineAudio, load_bank
+
+
+def frame_cost(audio: EngineAudio, frames: int):
+    """Mean time of a frame's engine audio work, as Game.step does it."""
+    audio.start_engine()
+    audio.start_ch.stop()  # skip straight to the bank
+    while not audio._play_bank():
+        time.sleep(0.001)
+
+    config = audio.config
+    top_wheel_rpm = (config.max_rpm - config.idle_rpm) / config.gear_ratio
+    start = time.perf_counter()
+    for i in range(frames):
+        audio.set_throttle(i % 120 < 60)
+        audio.set_wheel_rpm(top_wheel_rpm * abs(math.sin(i / 300)))
+        audio.step(1 / 60)
+    cost = (time.perf_counter() - start) / frames
+    audio.stop()
+    return cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    print(
+        f"{'truck':<20} {'loops':>6} {'build ms':>9} {'cached ms':>10} "
+        f"{'frame us':>9}"
+    )
+    for truck in TRUCKS:
+        config = truck.engine_sounds
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            load_bank(config, cache_dir)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            load_bank(config, cache_dir)
+            cached = time.perf_counter() - start
+
+        frame = frame_cost(EngineAudio(config), args.frames)
+        print(
+            f"{truck.name:<20} {config.bank_size:>6} {build * 1000:>9.1f} "
+            f"{cached * 1000:>10.1f} {frame * 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark the frame pipeline for every level and truck combination. Each
+pair is loaded through Game.init, then driven with a scripted input trace
+while the time spent in each phase of Game.step is recorded, along with how
+well the truck's rotated sprite caches did. Results are written as JSON and
+can be compared against a stored baseline.
+
+Each level is also run with parallax background layers added, marked "+bg",
+since no shipped level has any yet.
+
+Runs under SDL's dummy video and audio drivers, so no display is needed.
+From the monster_truck directory:
+
+    python -m benchmarks.bench_frames --output bench_frames.json
+    python -m benchmarks.bench_frames --baseline bench_frames.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from pymunk import Vec2d
+
+from monster_truck.config import MENU_STATE
+from monster_truck.configs.interfaces import BackgroundConfig
+from monster_truck.configs.levels import LEVELS
+from monster_truck.configs.trucks import TRUCKS
+from monster_truck.controllers import ScriptedController
+from monster_truck.game import Game
+
+# phases timed inside Game.step by its FrameProfiler
+STEP_PHASES = ["physics", "terrain", "truck", "hud", "flip", "engine_audio"]
+PHASES = ["load"] + STEP_PHASES + ["frame"]
+
+# two tiled layers at different depths, the palette image stands in for art
+BACKGROUNDS = [
+    BackgroundConfig(
+        "assets/color_theme.jpeg",
+        Vec2d(-200, 500),
+        Vec2d(1400, 1000),
+        tile_dimensions=Vec2d(40, 60),
+        parallax=0.3,
+    ),
+    BackgroundConfig(
+        "assets/color_theme.jpeg",
+        Vec2d(-200, 500),
+        Vec2d(1400, 1000),
+        tile_dimensions=Vec2d(20, 30),
+        parallax=0.6,
+    ),
+]
+
+# drive, ease off, drive, brake, drive, with a short reverse in the middle
+INPUT_TRACE = [
+    (0.0, -1, False),
+    (3.0, 0, False),
+    (3.5, -1, False),
+    (6.0, 0, True),
+    (6.5, 1, False),
+    (7.0, -1, False),
+]
+
+
+def summarize(samples: list[float]):
+    """Mean and tail percentiles in milliseconds."""
+    ms = np.array(samples) * 1000
+    return {
+        "mean": float(ms.mean()),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+    }
+
+
+def bench_pair(game: Game, level, truck, frames: int, loads: int):
+    game.level_config = level
+    game.truck_config = truck
+
+    load_times = []
+    for _ in range(loads):
+        start = time.perf_counter()
+        game.init()
+        load_times.append(time.perf_counter() - start)
+
+    game.controller = ScriptedController(INPUT_TRACE)
+    game.profiler.enabled = True
+    game.profiler.end_frame()
+    samples = {phase: [] for phase in STEP_PHASES + ["frame"]}
+    for _ in range(frames):
+        start = time.perf_counter()
+        state = game.step(1 / 60)
+        samples["frame"].append(time.perf_counter() - start)
+        timings = game.profiler.end_frame()
+        for phase in STEP_PHASES:
+            samples[phase].append(timings.get(phase, 0.0))
+        if state == MENU_STATE.GAME_OVER:
+            game.restart()
+    game.profiler.enabled = False
+
+    results = {"load": summarize(load_times)}
+    results.update({phase: summarize(values) for phase, values in samples.items()})
+    return results, game.truck.sprite_cache_stats()
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Print changes against a baseline, returning the regressions."""
+    regressions = []
+    print(f"\n{'pair':<34} {'phase':<8} {'stat':<5} {'base ms':>9} {'now ms':>9}")
+    for pair, phases in results["results"].items():
+        base_phases = baseline["results"].get(pair)
+        if base_phases is None:
+            continue
+        for phase, stats in phases.items():
+            for stat in ("mean", "p95"):
+                base = base_phases.get(phase, {}).get(stat)
+                if not base:
+                    continue
+                now = stats[stat]
+                change = (now - base) / base
+                flag = ""
+                if change > threshold:
+                    flag = f"  +{change:.0%} REGRESSION"
+                    regressions.append((pair, phase, stat, change))
+                print(
+                    f"{pair:<34} {phase:<8} {stat:<5} {base:>9.3f} {now:>9.3f}{flag}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--loads", type=int, default=5)
+    parser.add_argument("--output", help="path to write the JSON results to")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="fractional slowdown vs the baseline that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    pygame.init()
+    game = Game(pygame.time.Clock())
+    results = {
+        "meta": {
+            "frames": args.frames,
+            "loads": args.loads,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+        },
+        "results": {},
+        "sprite_cache": {},
+    }
+
+    print(f"{'pair':<34} " + " ".join(f"{p:>16}" for p in PHASES))
+    print(f"{'':<34} " + " ".join(f"{'mean/p99 ms':>16}" for _ in PHASES))
+    levels = [(level.name, level) for level in LEVELS] + [
+        (f"{level.name} +bg", dataclasses.replace(level, backgrounds=BACKGROUNDS))
+        for level in LEVELS
+    ]
+    for level_name, level in levels:
+        for truck in TRUCKS:
+            pair = f"{level_name} | {truck.name}"
+            stats, sprite_cache = bench_pair(
+                game, level, truck, args.frames, args.loads
+            )
+            results["results"][pair] = stats
+            results["sprite_cache"][pair] = sprite_cache
+            cells = [
+                f"{stats[p]['mean']:>8.3f}/{stats[p]['p99']:<7.3f}" for p in PHASES
+            ]
+            print(f"{pair:<34} " + " ".join(cells))
+
+    print(
+        f"\n{'pair':<34} {'sprite':<12} {'hit rate':>9} {'misses':>7} "
+        f"{'entries':>8} {'KB':>8}"
+    )
+    for pair, sprites in results["sprite_cache"].items():
+        for sprite, cache in sprites.items():
+            print(
+                f"{pair:<34} {sprite:<12} {cache['hit_rate']:>9.1%} "
+                f"{cache['misses']:>7} {cache['entries']:>8} "
+                f"{cache['bytes'] / 1024:>8.0f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nwrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
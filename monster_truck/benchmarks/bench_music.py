@@ -0,0 +1,129 @@
+"""
+Compare startup time and resident memory of the streaming Music engine with
+decoding the whole soundtrack up front, as Music used to. A synthetic
+soundtrack of WAV tracks is generated, then each mode runs in a fresh
+process so their memory use doesn't mix.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_music
+    python -m benchmarks.bench_music --tracks 20 --seconds 180
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+SAMPLE_RATE = 44100
+
+
+def write_soundtrack(music_dir: Path, tracks: int, seconds: float):
+    """Write tracks of quiet stereo noise, which decode like real music."""
+    rng = np.random.default_rng(0)
+    frames = int(seconds * SAMPLE_RATE)
+    for i in range(tracks):
+        samples = rng.integers(-2000, 2000, size=(frames, 2), dtype=np.int16)
+        with wave.open(str(music_dir / f"track_{i:02d}.wav"), "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(samples.tobytes())
+
+
+def rss_mb():
+    """Current resident set size of this process."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def measure(mode: str, music_dir: str):
+    """Start music in this process, reporting timings and memory as JSON."""
+    pygame.mixer.init(SAMPLE_RATE)
+    base_rss = rss_mb()
+    start = time.perf_counter()
+
+    if mode == "eager":
+        # the old behaviour, every track decoded before the first frame
+        tracks = sorted(Path(music_dir).iterdir())
+        sounds = [pygame.mixer.Sound(t) for t in tracks]
+        pygame.mixer.Channel(0).play(sounds[0])
+        startup = time.perf_counter() - start
+        first_play = startup
+    else:
+        from monster_truck.music import Music
+
+        music = Music(music_dir)
+        startup = time.perf_counter() - start
+        while not music.playing:
+            time.sleep(0.001)
+            music.step(0.001)
+        first_play = time.perf_counter() - start
+        # let the next track finish decoding, the steady state memory use
+        while music._next is not None and not music._next.done():
+            time.sleep(0.01)
+        music.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "startup_ms": startup * 1000,
+                "first_play_ms": first_play * 1000,
+                "rss_mb": rss_mb() - base_rss,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tracks", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--measure", choices=["eager", "streaming"], help="internal")
+    parser.add_argument("--music-dir", help="internal")
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.music_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_soundtrack(Path(tmp), args.tracks, args.seconds)
+        size = sum(p.stat().st_size for p in Path(tmp).iterdir()) / 1e6
+        print(f"{args.tracks} tracks of {args.seconds:.0f}s, {size:.0f} MB of WAV\n")
+        print(f"{'mode':<10} {'startup ms':>11} {'first play ms':>14} {'RSS MB':>8}")
+        for mode in ("eager", "streaming"):
+            out = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_music",
+                    "--measure",
+                    mode,
+                    "--music-dir",
+                    tmp,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:<10} {result['startup_ms']:>11.1f} "
+                f"{result['first_play_ms']:>14.1f} {result['rss_mb']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
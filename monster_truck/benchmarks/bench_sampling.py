@@ -0,0 +1,74 @@
+"""
+Compare the scalar and vectorized terrain samplers.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_sampling
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from monster_truck.configs.levels import LEVELS
+from monster_truck.level_utils import load_svg, sample_paths, sample_paths_array
+
+
+def synthetic_path(length_m: float, units_per_meter: float, seed: int = 0):
+    """Build a rolling-hills path string roughly length_m world meters long."""
+    rng = random.Random(seed)
+    x, y = 0.0, 500.0
+    parts = [f"M{x},{y}"]
+    end = length_m * units_per_meter
+    while x < end:
+        dx = rng.uniform(50, 250)
+        dy = rng.uniform(-80, 80)
+        parts.append(
+            f"C{x + dx / 3},{y - dy},{x + 2 * dx / 3},{y + dy},{x + dx},{y + dy / 2}"
+        )
+        x, y = x + dx, y + dy / 2
+    return " ".join(parts)
+
+
+def bench(name: str, paths: list[str], units: float, samples: int, repeat: int):
+    scalar = sample_paths(paths, units, samples)
+    vector = sample_paths_array(paths, units, samples)
+    reference = np.array([(p.x, p.y) for p in scalar])
+    assert reference.shape == vector.shape, (reference.shape, vector.shape)
+    error = np.abs(reference - vector).max()
+
+    t_scalar = min(
+        timeit.repeat(
+            lambda: sample_paths(paths, units, samples), number=1, repeat=repeat
+        )
+    )
+    t_vector = min(
+        timeit.repeat(
+            lambda: sample_paths_array(paths, units, samples), number=1, repeat=repeat
+        )
+    )
+    print(
+        f"{name:<22} {samples:>4} {len(vector):>8} "
+        f"{t_scalar * 1000:>10.2f} {t_vector * 1000:>10.2f} "
+        f"{t_scalar / t_vector:>8.1f}x {error:>10.2e}"
+    )
+
+
+def main():
+    print(
+        f"{'level':<22} {'spm':>4} {'points':>8} "
+        f"{'scalar ms':>10} {'vector ms':>10} {'speedup':>9} {'max err':>10}"
+    )
+    for level in LEVELS:
+        paths = load_svg(level.svg_path)
+        for samples in (level.samples_per_meter, 8, 32):
+            bench(level.name, paths, level.units_per_meter, samples, repeat=5)
+
+    paths = [synthetic_path(20_000, 5)]
+    for samples in (2, 8):
+        bench("synthetic 20km", paths, 5, samples, repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measure startup from launching the process: time to the first frame drawn,
+time until the main menu is interactive, and time until everything the game
+needs has loaded, along with the memory held by the loaded assets. Staged startup, the splash then the menus with the game
+loading in the background, is compared with building the whole game before
+the first frame, as run_game used to. Each launch is a fresh process.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def measure(mode: str, launched: float):
+    """Start the game in this process, reporting stage times as JSON."""
+    # imported here, so their cost counts towards startup
+    import pygame
+
+    from monster_truck.assets import ASSETS
+    from monster_truck.config import LEVELS
+    from monster_truck.engine_audio import EngineAudio
+    from monster_truck.game import Game
+    from monster_truck.level_loader import LevelPreloader
+    from monster_truck.menus import MainMenu
+    from monster_truck.music import Music
+    from monster_truck.startup import show_splash, start_game
+
+    pygame.init()
+    if mode == "staged":
+        show_splash()
+        first_frame = time.time()
+        game, music = start_game()
+        MainMenu(game.screen).step([], 0.0, game.loading_progress())
+        interactive = time.time()
+        game.loader.wait()
+    else:
+        # the old run_game, the game built in full before the menu's first frame
+        preloader = LevelPreloader(LEVELS)
+        game = Game(pygame.time.Clock(), preloader)  # opens the window
+        game.sfx = EngineAudio(game.truck_config.engine_sounds)
+        game.load_hud()
+        music = Music()
+        pygame.font.SysFont("Impact", 25)
+        MainMenu(game.screen).step([], 0.0)
+        first_frame = interactive = time.time()
+        preloader.wait()
+    loaded = time.time()
+    music.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "first_frame_ms": (first_frame - launched) * 1000,
+                "interactive_ms": (interactive - launched) * 1000,
+                "loaded_ms": (loaded - launched) * 1000,
+                "assets": ASSETS.report(),
+            }
+        )
+    )
+
+
+def launch(mode: str):
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_startup",
+            "--measure",
+            mode,
+            "--launched",
+            repr(time.time()),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--measure", choices=["staged", "eager"], help="internal")
+    parser.add_argument("--launched", type=float, help="internal")
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.launched)
+        return
+
+    print(f"median of {args.runs} launches\n")
+    print(
+        f"{'mode':<8} {'first frame ms':>15} {'interactive ms':>15} "
+        f"{'loaded ms':>10}"
+    )
+    reports = {}
+    for mode in ("eager", "staged"):
+        results = [launch(mode) for _ in range(args.runs)]
+        first_frame, interactive, loaded = (
+            statistics.median(r[key] for r in results)
+            for key in ("first_frame_ms", "interactive_ms", "loaded_ms")
+        )
+        print(f"{mode:<8} {first_frame:>15.1f} {interactive:>15.1f} {loaded:>10.1f}")
+        reports[mode] = results[-1]["assets"]
+
+    for mode, report in reports.items():
+        print(f"\n{mode} once loaded, {report}")
+
+
+if __name__ == "__main__":
+    main()
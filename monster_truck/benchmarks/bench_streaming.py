@@ -0,0 +1,91 @@
+"""
+Compare physics step cost with the whole terrain in the space against
+streaming it in chunks around the truck. Each shipped level is driven headless
+with a scripted input trace, once as configured and once with streaming forced
+on, reporting the terrain segments in the space and the step time, including
+the streamer's chunk updates.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_streaming
+    python -m benchmarks.bench_streaming --chunk-width 20 --window 60
+"""
+
+import argparse
+import dataclasses
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+from monster_truck.configs.interfaces import LevelConfig
+from monster_truck.configs.levels import LEVELS
+from monster_truck.controllers import ScriptedController
+from monster_truck.game import Game
+
+# full throttle, with a brake and a short reverse so chunks stream both ways
+INPUT_TRACE = [
+    (0.0, -1, False),
+    (6.0, 0, True),
+    (6.5, 1, False),
+    (8.0, -1, False),
+]
+
+
+def drive(level: LevelConfig, steps: int):
+    """
+    Drive a level headless.
+
+    Returns:
+        (segment counts, step times in seconds), one of each per physics step.
+    """
+    game = Game(headless=True, controller=ScriptedController(INPUT_TRACE))
+    game.level_config = level
+    game.init()
+
+    dt = 1 / game.physics_hz
+    segments, times = [], []
+    for _ in range(steps):
+        start = time.perf_counter()
+        finished = game.physics_step(dt)
+        times.append(time.perf_counter() - start)
+        streamer = game.terrain_streamer
+        segments.append(
+            len(game.terrain) if streamer is None else streamer.segment_count
+        )
+        if finished:
+            game.restart()
+    return np.array(segments), np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=1200)
+    parser.add_argument("--chunk-width", type=float, default=20.0)
+    parser.add_argument("--window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'level':<16} {'mode':<10} {'segments':>9} {'max':>6} "
+        f"{'step us':>8} {'p99 us':>8}"
+    )
+    for level in LEVELS:
+        streamed = dataclasses.replace(
+            level, stream_chunk_width=args.chunk_width, stream_window=args.window
+        )
+        modes = [("as config", level), ("streamed", streamed)]
+        for mode, config in modes:
+            segments, times = drive(config, args.steps)
+            us = times * 1e6
+            print(
+                f"{level.name:<16} {mode:<10} {segments.mean():>9.0f} "
+                f"{segments.max():>6} {us.mean():>8.1f} "
+                f"{np.percentile(us, 99):>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
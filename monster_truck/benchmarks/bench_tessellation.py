@@ -0,0 +1,92 @@
+"""
+Compare fixed-density terrain sampling against adaptive tessellation: static
+segment counts, worst chord error and the resulting physics step cost.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_tessellation
+"""
+
+import os
+import time
+from dataclasses import replace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from monster_truck.configs.interfaces import LevelConfig
+from monster_truck.configs.levels import LEVELS
+from monster_truck.game import Game
+from monster_truck.level_utils import load_level_points
+
+TOLERANCES = (None, 0.01, 0.02, 0.05, 0.1)
+REFERENCE_SAMPLES_PER_METER = 32
+STEPS = 600
+
+
+def max_deviation(reference: np.ndarray, polyline: np.ndarray, chunk: int = 2048):
+    """The largest distance from any reference point to the polyline."""
+    a = polyline[:-1]
+    ab = polyline[1:] - a
+    ab_len2 = np.maximum((ab**2).sum(axis=1), 1e-12)
+    worst = 0.0
+    for start in range(0, len(reference), chunk):
+        p = reference[start : start + chunk, None, :]
+        t = np.clip(((p - a) * ab).sum(axis=2) / ab_len2, 0.0, 1.0)
+        closest = a + t[..., None] * ab
+        dist = np.sqrt(((p - closest) ** 2).sum(axis=2)).min(axis=1)
+        worst = max(worst, dist.max())
+    return worst
+
+
+def step_cost(game: Game, level: LevelConfig):
+    game.level_config = level
+    game.init()
+    game.truck.motor.update_target(-1)
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        game.truck.motor.step()
+        game.space.step(1 / 60)
+    return (time.perf_counter() - start) / STEPS
+
+
+def main():
+    pygame.init()
+    game = Game(pygame.time.Clock())
+    print(
+        f"{'level':<16} {'tolerance':>9} {'segments':>9} {'vs fixed':>9} "
+        f"{'max err m':>10} {'step us':>9}"
+    )
+    for level in LEVELS:
+        reference = load_level_points(
+            level.svg_path,
+            level.units_per_meter,
+            REFERENCE_SAMPLES_PER_METER,
+            cache_dir=None,
+        )
+        fixed_segments = None
+        for tolerance in TOLERANCES:
+            config = replace(level, tessellation_tolerance=tolerance)
+            points = load_level_points(
+                config.svg_path,
+                config.units_per_meter,
+                config.samples_per_meter,
+                tolerance,
+                cache_dir=None,
+            )
+            segments = len(points) - 1
+            fixed_segments = fixed_segments or segments
+            label = "fixed" if tolerance is None else f"{tolerance:g}"
+            print(
+                f"{level.name:<16} {label:>9} {segments:>9} "
+                f"{segments / fixed_segments:>8.0%} "
+                f"{max_deviation(reference, points):>10.3f} "
+                f"{step_cost(game, config) * 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Check that physics step time stays flat across repeated truck resets. The
+pooled Truck.reset path is compared with the old behaviour of building a new
+Truck on every reset, which left the previous one in the space.
+
+Run from the monster_truck directory:
+
+    python -m benchmarks.bench_truck_reset
+"""
+
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from monster_truck.game import Game
+from monster_truck.truck import Truck
+
+RESETS = 100
+STEPS = 120
+
+
+def step_time(game: Game):
+    """Mean space.step time while driving from the current spawn point."""
+    game.truck.motor.update_target(-1)
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        game.truck.motor.step()
+        game.space.step(1 / 60)
+    return (time.perf_counter() - start) / STEPS
+
+
+def leaked_reset(game: Game):
+    """The old reset_truck, which built a new truck on top of the old one."""
+    game.truck = Truck(game.truck_config, game.space, game.default_start_position)
+
+
+def run(name: str, game: Game, reset):
+    game.init()
+    before = step_time(game)
+    start = time.perf_counter()
+    for _ in range(RESETS):
+        reset()
+    reset_ms = (time.perf_counter() - start) / RESETS * 1000
+    after = step_time(game)
+    print(
+        f"{name:<10} {before * 1e6:>10.1f} {after * 1e6:>10.1f} "
+        f"{after / before:>7.2f}x {reset_ms:>9.3f} {len(game.space.bodies):>7}"
+    )
+    return after / before
+
+
+def main():
+    pygame.init()
+    game = Game(pygame.time.Clock())
+    print(
+        f"{'reset':<10} {'before us':>10} {'after us':>10} {'ratio':>8} "
+        f"{'reset ms':>9} {'bodies':>7}"
+    )
+    print(f"{'':<10} (step time before and after {RESETS} resets)")
+    ratio = run("pooled", game, game.reset_truck)
+    run("rebuild", game, lambda: leaked_reset(game))
+
+    if ratio > 1.25:
+        raise SystemExit(f"step time grew {ratio:.2f}x after {RESETS} resets")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
+import argparse
 import sys
 
 import pygame
 
 from monster_truck.config import *
 from monster_truck.game import Game
-from monster_truck.music import Music
+from monster_truck.recording import ReplayController, RunRecording
+from monster_truck.simulation import replay_run
+from monster_truck.startup import show_splash, start_game
 from monster_truck.menus import (
     MENU_STATE,
     MainMenu,
     LevelSelectMenu,
     game_over,
+    loading_screen,
     pause_screen,
 )
 
@@ -17,50 +21,43 @@ from monster_truck.menus import (
 pygame.init()
 
 
-def run_game():
-    clock = pygame.time.Clock()
-    game = Game(clock)
-    music = Music()
-    menu_font = pygame.font.SysFont("Impact", 25)
+def run_game(record_dir: str | None = None):
+    # the splash shows before anything loads, then only the menus are loaded
+    # up front, and the rest of the game loads in the background
+    show_splash()
+    game, music = start_game(record_dir)
+    clock = game.clock
+    menu_font = None
     state = MENU_STATE.MAIN_MENU
     menu = None
 
+    # F3 toggles the frame profiler overlay and the hitch log
+    profiler = game.profiler
+
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
-        music.step(dt)
+        profiler.end_frame()
+        with profiler.phase("music"):
+            music.step(dt)
 
-        events = pygame.event.get()
+        with profiler.phase("events"):
+            events = pygame.event.get()
         for e in events:
             if e.type == pygame.QUIT:
+                game.save_recording()
+                game.loader.shutdown()
+                game.preloader.shutdown()
+                music.shutdown()
+                profiler.close()
                 return
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_n:
                     music.next()
+                elif e.key == pygame.K_F3:
+                    game.toggle_profiler()
 
-        if state == MENU_STATE.MAIN_MENU:
-            if not isinstance(menu, MainMenu):
-                menu = MainMenu(game.screen)
-            state = menu.step(events, dt)
-            continue
-        elif state == MENU_STATE.LEVEL_SELECT:
-            if not isinstance(menu, LevelSelectMenu):
-                menu = LevelSelectMenu(game.screen)
-            state = menu.step(events, game, dt)
-        elif state == MENU_STATE.GAME_OVER:
-            game.sfx.stop()
-            state = game_over(game.screen, events, menu_font, game)
-            continue
-        elif state == MENU_STATE.PAUSE:
-            game.sfx.stop()
-            state = pause_screen(game.screen, events, menu_font)
-        elif state == MENU_STATE.QUIT:
-            running = False
-            continue
-        elif state == MENU_STATE.START_GAME:
-            game.init()
-            state = MENU_STATE.RUN_GAME
-        else:
+        if state == MENU_STATE.RUN_GAME:
             for e in events:
                 if e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_ESCAPE:
@@ -70,9 +67,107 @@ def run_game():
 
             if state == MENU_STATE.RUN_GAME:
                 state = game.step(dt)
+            continue
+
+        if menu_font is None and game.loader.ready:
+            menu_font = pygame.font.SysFont("Impact", 25)
+        with profiler.phase("menu"):
+            state, menu = step_menu(state, menu, events, menu_font, game, dt)
+        if state == MENU_STATE.QUIT:
+            game.save_recording()
+            game.loader.shutdown()
+            game.preloader.shutdown()
+            music.shutdown()
+            profiler.close()
+            running = False
+
+
+def replay_game(path: str, unthrottled: bool = False):
+    """
+    Replay a run file, either on screen in real time or headless as fast as
+    possible.
+    """
+    recording = RunRecording.load(path)
+    if unthrottled:
+        result = replay_run(recording)
+        print(
+            f"{result.level} | {result.truck}: "
+            f"completed={result.completed} time={result.sim_time:.3f}s "
+            f"checkpoints={result.checkpoints_reached} flips={result.flips} "
+            f"bounces={result.bounces} "
+            f"steps={result.steps} wall={result.wall_time:.3f}s"
+        )
+        return
+
+    level = load_level_config(recording.level)
+    truck = load_truck_config(recording.truck)
+    recording.check(level, truck, PHYSICS_HZ)
+
+    clock = pygame.time.Clock()
+    controller = ReplayController(recording)
+    game = Game(clock, controller=controller)
+    game.level_config = level
+    game.truck_config = truck
+    game.init()
+
+    state = MENU_STATE.RUN_GAME
+    while state == MENU_STATE.RUN_GAME and not controller.finished:
+        dt = clock.tick(FPS) / 1000.0
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                return
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+                return
+        state = game.step(dt)
+    game.sfx.stop()
+
+
+def step_menu(state, menu, events, menu_font, game: Game, dt: float):
+    """
+    Step whichever menu or transition the state calls for.
+
+    Returns:
+        (state, menu), the next state and the menu to keep for the next frame.
+    """
+    if state == MENU_STATE.MAIN_MENU:
+        if not isinstance(menu, MainMenu):
+            menu = MainMenu(game.screen)
+        state = menu.step(events, dt, game.loading_progress())
+    elif state == MENU_STATE.LEVEL_SELECT:
+        if not isinstance(menu, LevelSelectMenu):
+            menu = LevelSelectMenu(game.screen)
+        state = menu.step(events, game, dt)
+    elif state == MENU_STATE.GAME_OVER:
+        game.sfx.stop()
+        state = game_over(game.screen, events, menu_font, game)
+    elif state == MENU_STATE.LOADING:
+        state = loading_screen(game.screen, events, game)
+    elif state == MENU_STATE.PAUSE:
+        game.sfx.stop()
+        state = pause_screen(game.screen, events, menu_font)
+    elif state == MENU_STATE.START_GAME:
+        game.init()
+        state = MENU_STATE.RUN_GAME
+    elif state == MENU_STATE.RESTART_GAME:
+        game.restart()
+        state = MENU_STATE.RUN_GAME
+    return state, menu
 
 
 if __name__ == "__main__":
-    run_game()
+    parser = argparse.ArgumentParser(description="Monster Trucks!")
+    parser.add_argument("--record", metavar="DIR", help="save a run file per run")
+    parser.add_argument("--replay", metavar="RUN", help="replay a run file")
+    parser.add_argument(
+        "--unthrottled",
+        action="store_true",
+        help="replay headless as fast as possible instead of in real time",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        replay_game(args.replay, args.unthrottled)
+    else:
+        run_game(args.record)
     pygame.quit()
     sys.exit()
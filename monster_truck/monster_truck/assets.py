@@ -0,0 +1,224 @@
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pygame
+
+GLOBAL_SCOPE = "global"
+
+
+class AssetManager:
+    """
+    Loads images and sounds once and hands out shared references, keyed by
+    path. Images are converted for fast blitting when they are loaded, so
+    callers get a surface ready to draw. Shared surfaces must not be modified,
+    copy them first.
+
+    Every asset belongs to one or more scopes. Assets only needed by a single
+    level are loaded into that level's scope, and unload drops them when the
+    level is left. Assets in the global scope stay loaded.
+
+    Assets can be loaded from background threads. Files are decoded outside
+    the manager's lock, so the main thread isn't held up by a background
+    load, but images are only converted for the display on the main thread.
+
+    Attributes:
+        hits: Loads served from memory.
+        misses: Loads that went to disk.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._images: dict[str, pygame.Surface] = {}
+        # images loaded before there was a display to convert them for
+        self._unconverted: set[str] = set()
+        self._sounds: dict[str, pygame.mixer.Sound] = {}
+        self._scopes: dict[str, set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def image(self, path: str, scope: str = GLOBAL_SCOPE):
+        """
+        Get an image, loading and converting it the first time it is asked
+        for. Without a display, or off the main thread, the image is returned
+        unconverted, and it is converted the first time the main thread asks
+        for it once there is a display.
+
+        Args:
+            path: The image file.
+            scope: The scope the image is needed by.
+        """
+        key = _key(path)
+        with self._lock:
+            surface = self._images.get(key)
+        loaded = pygame.image.load(path) if surface is None else None
+        with self._lock:
+            # another thread may have loaded it meanwhile
+            surface = self._images.get(key)
+            if surface is None:
+                self.misses += 1
+                surface = self._images[key] = loaded
+                self._unconverted.add(key)
+            else:
+                self.hits += 1
+            self._scopes[key].add(scope)
+
+            if key in self._unconverted and _can_convert():
+                surface = self._images[key] = surface.convert_alpha()
+                self._unconverted.discard(key)
+        return surface
+
+    def sound(self, path: str, scope: str = GLOBAL_SCOPE):
+        """
+        Get a sound, decoding it the first time it is asked for.
+
+        Args:
+            path: The sound file.
+            scope: The scope the sound is needed by.
+        """
+        key = _key(path)
+        with self._lock:
+            sound = self._sounds.get(key)
+        loaded = pygame.mixer.Sound(path) if sound is None else None
+        with self._lock:
+            sound = self._sounds.get(key)
+            if sound is None:
+                self.misses += 1
+                sound = self._sounds[key] = loaded
+            else:
+                self.hits += 1
+            self._scopes[key].add(scope)
+        return sound
+
+    def unload(self, scope: str):
+        """
+        Release a scope's claim on its assets, dropping the ones no other
+        scope needs. Anything still holding a reference keeps its copy alive.
+
+        Returns:
+            The number of assets dropped.
+        """
+        dropped = 0
+        with self._lock:
+            for key in list(self._scopes):
+                scopes = self._scopes[key]
+                scopes.discard(scope)
+                if scopes:
+                    continue
+                del self._scopes[key]
+                self._images.pop(key, None)
+                self._unconverted.discard(key)
+                self._sounds.pop(key, None)
+                dropped += 1
+        return dropped
+
+    def memory_usage(self):
+        """
+        The approximate memory held by loaded assets.
+
+        Returns:
+            {"images": bytes, "sounds": bytes, "total": bytes, "by_scope":
+            {scope: bytes}, "assets": {path: bytes}}. Assets shared by several
+            scopes count towards each of them.
+        """
+        with self._lock:
+            loaded_images = dict(self._images)
+            loaded_sounds = dict(self._sounds)
+            asset_scopes = {key: set(scopes) for key, scopes in self._scopes.items()}
+        assets = {key: _surface_bytes(s) for key, s in loaded_images.items()}
+        assets.update({key: _sound_bytes(s) for key, s in loaded_sounds.items()})
+
+        by_scope = defaultdict(int)
+        for key, scopes in asset_scopes.items():
+            for scope in scopes:
+                by_scope[scope] += assets.get(key, 0)
+
+        images = sum(assets[key] for key in loaded_images)
+        sounds = sum(assets[key] for key in loaded_sounds)
+        return {
+            "images": images,
+            "sounds": sounds,
+            "total": images + sounds,
+            "by_scope": dict(by_scope),
+            "assets": assets,
+        }
+
+    def report(self):
+        """A printable summary of memory_usage."""
+        usage = self.memory_usage()
+        lines = [
+            f"assets: {len(self._images)} images {usage['images'] / 1e6:.1f} MB, "
+            f"{len(self._sounds)} sounds {usage['sounds'] / 1e6:.1f} MB, "
+            f"{self.hits} hits / {self.misses} misses"
+        ]
+        for scope, size in sorted(usage["by_scope"].items()):
+            lines.append(f"  {scope}: {size / 1e6:.1f} MB")
+        return "\n".join(lines)
+
+
+class BackgroundLoader:
+    """
+    Runs loading tasks one at a time, in order, on a background thread, so
+    the menus can show while the game loads. Progress is the fraction of
+    tasks finished, for a loading bar.
+    """
+
+    def __init__(self, tasks: list[Callable[[], object]]):
+        """
+        Args:
+            tasks: The tasks to run, in order.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="background-loader"
+        )
+        self._futures: list[Future] = [self._executor.submit(t) for t in tasks]
+
+    @property
+    def progress(self):
+        if not self._futures:
+            return 1.0
+        return sum(future.done() for future in self._futures) / len(self._futures)
+
+    @property
+    def ready(self):
+        """Whether every task has finished."""
+        return all(future.done() for future in self._futures)
+
+    def wait(self):
+        """Wait for every task, raising the first error any of them hit."""
+        for future in self._futures:
+            future.result()
+
+    def shutdown(self):
+        """Stop the loader thread, dropping any tasks not yet started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _can_convert():
+    # surfaces are converted for the display, which belongs to the main thread
+    return (
+        pygame.display.get_surface() is not None
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+def _key(path: str):
+    return os.path.normpath(str(path))
+
+
+def _surface_bytes(surface: pygame.Surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _sound_bytes(sound: pygame.mixer.Sound):
+    mixer = pygame.mixer.get_init()
+    if mixer is None:
+        return 0
+    frequency, size, channels = mixer
+    return round(sound.get_length() * frequency) * abs(size) // 8 * channels
+
+
+# the assets shared by the whole game
+ASSETS = AssetManager()
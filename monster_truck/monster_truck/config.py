@@ -11,17 +11,28 @@ class MENU_STATE(Enum):
     TRUCK_SELECT = 4
     GAME_OVER = 5
     PAUSE = 6
+    LOADING = 7
     START_GAME = 100
+    RESTART_GAME = 101
     RUN_GAME = 110
     QUIT = 300
 
 
 # ---------- GAME DEFAULTS ----------
 FPS = 60
+PHYSICS_HZ = 120  # fixed physics steps per second, independent of FPS
+MAX_PHYSICS_SUBSTEPS = 8  # physics steps per frame before dropping time
 PX_PER_METER = 20  # how many pixels equal 1 meter
 SCREEN_W = 2048  # ~34m
 SCREEN_H = 1200  # ~20m
 
+# ---------- PROFILING ----------
+HITCH_THRESHOLD_MS = 50  # frames slower than this are logged while profiling
+HITCH_LOG_PATH = "logs/hitches.csv"
+
+# ---------- GHOSTS ----------
+GHOST_DIR = "ghosts"  # best run ghost per level/truck pair
+
 
 def load_truck_config(name: str | None = None) -> TruckConfig:
     if name is None:
@@ -33,5 +44,11 @@ def load_truck_config(name: str | None = None) -> TruckConfig:
     raise ValueError(f"Truck '{name}' not found")
 
 
-def load_level_config(item: int = 0) -> LevelConfig:
-    return LEVELS[item]
+def load_level_config(item: int | str = 0) -> LevelConfig:
+    if isinstance(item, int):
+        return LEVELS[item]
+
+    for level in LEVELS:
+        if level.name == item:
+            return level
+    raise ValueError(f"Level '{item}' not found")
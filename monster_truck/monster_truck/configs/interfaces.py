@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from pymunk import Vec2d
 
@@ -87,6 +87,33 @@ class WheelConfig:
         return Vec2d(diameter, diameter)
 
 
+@dataclass
+class EngineSoundConfig:
+    """
+    The engine sound for a truck. A bank of loops is pitch shifted from the
+    recorded loops to engine speeds evenly spaced in pitch from idle_rpm to
+    max_rpm, and the engine crossfades between the two bank loops either side
+    of its current speed. The engine speed follows the driven wheels.
+
+    Attributes:
+        start: The path to the engine start sound.
+        loops:
+            Steady engine loops as (path, rpm), the engine speed each was
+            recorded at. Each bank loop is shifted from the nearest recording.
+        idle_rpm: (RPM) The engine speed with the wheels stopped.
+        max_rpm: (RPM) The highest engine speed.
+        gear_ratio: Engine revolutions per wheel revolution.
+        bank_size: The number of loops in the bank, at least 2.
+    """
+
+    start: str
+    loops: list[tuple[str, float]]
+    idle_rpm: float
+    max_rpm: float
+    gear_ratio: float
+    bank_size: int = 6
+
+
 @dataclass
 class TruckConfig:
     """
@@ -105,6 +132,7 @@ class TruckConfig:
             (Nm) The amount of torque applied to each axle. Since the two axles
             are geared together they will both always receive the same torque.
         brake_torque: (Nm) The amount of braking force torque.
+        engine_sounds: The engine sound effects.
     """
 
     name: str
@@ -115,13 +143,55 @@ class TruckConfig:
     rolling_resistance: float
     torque: float
     brake_torque: float
+    engine_sounds: EngineSoundConfig
 
 
 # ---------- Level Config Classes ----------
-# TODO: Things like ground friction and gravity should be an array of tuples
-# such as (start, end, gravity), or (start, end, color, friciton) for properties
-# that we want to be able to specify more isolated world sections with different
-# frictions or gravities.
+@dataclass
+class BackgroundConfig:
+    """
+    A world texture layer drawn behind the terrain.
+
+    Attributes:
+        sprite_path: The path to the texture image.
+        position: (meters) The world position of the top left of the layer.
+        dimensions: (meters) The size of the area the layer covers.
+        tile_dimensions:
+            (meters) The size of one repeat of the texture. If not set, the
+            texture is stretched over the whole area instead of tiled.
+        parallax:
+            How fast the layer scrolls relative to the terrain. 1 moves with
+            the terrain, 0 stays fixed on screen, and values between give
+            depth to distant layers.
+    """
+
+    sprite_path: str
+    position: Vec2d
+    dimensions: Vec2d
+    tile_dimensions: Vec2d | None = None
+    parallax: float = 1.0
+
+
+@dataclass
+class SurfaceZone:
+    """
+    A stretch of the level with its own ground surface, like mud, ice or rock.
+
+    Attributes:
+        start: The level SVG relative x coordinate the zone starts at.
+        end: The level SVG relative x coordinate the zone ends at.
+        friction: (coeff) The friction coefficient of the ground in the zone.
+        color: The ground fill color in the zone.
+    """
+
+    start: float
+    end: float
+    friction: float
+    color: tuple[int, int, int]
+
+
+# TODO: Gravity could be given per section of the level as well, like the
+# surface zones, as (start, end, gravity).
 @dataclass
 class LevelConfig:
     """
@@ -135,7 +205,9 @@ class LevelConfig:
         samples_per_meter:
             The target number of samples to take when lerping the terrain points
             in meters.
-        ground_friction: (coeff) The friction coefficient of the ground.
+        ground_friction:
+            (coeff) The friction coefficient of the ground outside any surface
+            zone.
         gravity: (m/s^2) The world gravity.
         start_position:
             The level x coordinate to start the truck on. The y value is calculated
@@ -146,6 +218,22 @@ class LevelConfig:
         checkpoints:
             x axis positions to provide checkpoints. If the player is stuck and
             resets the truck, they will spawn back at the nearest checkpoint.
+        tessellation_tolerance:
+            (meters) If set, the terrain is tessellated adaptively so it never
+            strays more than this from the SVG curves, and samples_per_meter
+            is ignored. Flat stretches then use far fewer segments.
+        stream_chunk_width:
+            (meters) If set, the terrain is split into chunks this wide and
+            only the chunks near the truck are kept in the physics space. Use
+            this for very long levels.
+        stream_window:
+            (meters) How far ahead of and behind the truck terrain chunks are
+            kept in the physics space when streaming.
+        backgrounds: Texture layers drawn behind the terrain.
+        ground_color: The ground fill color outside any surface zone.
+        surface_zones:
+            Sections of the level with their own ground friction and color.
+            Zones can't overlap.
     """
 
     name: str
@@ -157,3 +245,9 @@ class LevelConfig:
     start_position: float
     finish_line: float
     checkpoints: list[float]
+    tessellation_tolerance: float | None = None
+    stream_chunk_width: float | None = None
+    stream_window: float = 120.0
+    backgrounds: list[BackgroundConfig] = field(default_factory=list)
+    ground_color: tuple[int, int, int] = (173, 144, 127)
+    surface_zones: list[SurfaceZone] = field(default_factory=list)
@@ -1,6 +1,10 @@
 from pymunk import Vec2d
 
-from monster_truck.configs.interfaces import LevelConfig
+from monster_truck.configs.interfaces import LevelConfig, SurfaceZone
+
+MUD = dict(friction=0.6, color=(101, 77, 56))
+ICE = dict(friction=0.25, color=(196, 226, 240))
+ROCK = dict(friction=1.6, color=(128, 124, 120))
 
 LEVELS = [
     LevelConfig(
@@ -13,6 +17,7 @@ LEVELS = [
         start_position=230,
         finish_line=3815,
         checkpoints=[1433, 2493],
+        surface_zones=[SurfaceZone(1600, 2300, **MUD)],
     ),
     LevelConfig(
         name="Hills-n-Gaps",
@@ -24,5 +29,9 @@ LEVELS = [
         start_position=130,
         finish_line=3950,
         checkpoints=[930, 1700, 2100, 3350],
+        surface_zones=[
+            SurfaceZone(1750, 2050, **ICE),
+            SurfaceZone(2200, 3200, **ROCK),
+        ],
     ),
 ]
@@ -5,6 +5,7 @@ from pymunk import Vec2d
 from monster_truck.configs.interfaces import (
     TruckConfig,
     ChassisConfig,
+    EngineSoundConfig,
     WheelConfig,
     SuspensionConfig,
 )
@@ -37,6 +38,17 @@ def truck_1():
     wheel_f = copy.deepcopy(wheel_r)
     wheel_f.offset = Vec2d(chassis.dimensions.x / 3, -chassis.dimensions.y / 1.8)
 
+    engine_sounds = EngineSoundConfig(
+        start="assets/trucks/truck_1/sfx/truck_1_start.wav",
+        loops=[
+            ("assets/trucks/truck_1/sfx/truck_1_idle.wav", 900),
+            ("assets/trucks/truck_1/sfx/full_throttle.wav", 3200),
+        ],
+        idle_rpm=900,
+        max_rpm=4200,
+        gear_ratio=12.0,  # about 4000 RPM at top speed
+    )
+
     return TruckConfig(
         name="Simple Green™",
         chassis=chassis,
@@ -46,6 +58,7 @@ def truck_1():
         rolling_resistance=0.3,
         torque=22000,
         brake_torque=35000,
+        engine_sounds=engine_sounds,
     )
 
 
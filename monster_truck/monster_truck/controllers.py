@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+
+import pygame
+
+
+class Controller(ABC):
+    """
+    A source of driver inputs. Inputs are read once per physics step, so the
+    same controller always produces the same run.
+    """
+
+    @abstractmethod
+    def read(self, level_time: float):
+        """
+        Get the driver inputs for the physics step starting at level_time.
+
+        Args:
+            level_time: (seconds) The simulated time since the level started.
+
+        Returns:
+            (direction, braking), where direction is -1 (forward), 0 or 1
+            (reverse), matching MotorController.update_target.
+        """
+
+    def should_reset(self):
+        """
+        Whether the truck should be reset to its last checkpoint before the
+        next physics step. Only replays reset the truck this way, players
+        reset it through Game.reset_truck.
+        """
+        return False
+
+
+class KeyboardController(Controller):
+    """Reads the arrow keys and spacebar from the pygame keyboard state."""
+
+    def read(self, level_time: float):
+        keys = pygame.key.get_pressed()
+
+        direction = 0
+        if keys[pygame.K_RIGHT]:
+            direction = -1
+        elif keys[pygame.K_LEFT]:
+            direction = 1
+
+        return direction, bool(keys[pygame.K_SPACE])
+
+
+class ScriptedController(Controller):
+    """
+    Plays back a fixed input trace.
+
+    Attributes:
+        trace:
+            (start_time, direction, braking) entries sorted by start time.
+            Each entry holds until the next one starts. Before the first entry
+            no input is applied.
+    """
+
+    def __init__(self, trace: list[tuple[float, int, bool]]):
+        self.trace = sorted(trace, key=lambda entry: entry[0])
+        self._times = [entry[0] for entry in self.trace]
+
+    def read(self, level_time: float):
+        i = bisect_right(self._times, level_time) - 1
+        if i < 0:
+            return 0, False
+        _, direction, braking = self.trace[i]
+        return direction, braking
+
+
+def full_throttle_trace():
+    """A simple trace that holds the throttle down for the whole run."""
+    return [(0.0, -1, False)]
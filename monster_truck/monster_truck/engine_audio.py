@@ -0,0 +1,263 @@
+import bisect
+import hashlib
+import math
+import os
+import tempfile
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from monster_truck.assets import ASSETS
+from monster_truck.configs.interfaces import EngineSoundConfig
+
+
+# Pitch shifted engine loops are cached on disk, so a truck's bank is only
+# resampled the first time it's driven. Bump the version whenever resampling
+# output changes.
+ENGINE_BANK_CACHE_DIR = Path(".cache/engine_bank")
+ENGINE_BANK_CACHE_VERSION = 1
+
+# mixer channels 0 and 1 play the music
+START_CHANNEL = 2
+FIRST_BANK_CHANNEL = 3
+
+# every truck's bank loads on one shared background thread
+_BANK_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine-bank")
+
+
+def bank_rpms(config: EngineSoundConfig):
+    """The engine speeds of the bank's loops, evenly spaced in pitch."""
+    return [
+        float(rpm)
+        for rpm in np.geomspace(config.idle_rpm, config.max_rpm, config.bank_size)
+    ]
+
+
+def pitch_shift(samples: np.ndarray, ratio: float):
+    """
+    Resample a loop to play ratio times higher, and ratio times shorter.
+    Interpolation wraps around the end of the loop, so the shifted loop still
+    loops seamlessly.
+
+    Args:
+        samples: The (frames, channels) samples of the loop.
+        ratio: The pitch ratio, above 1 raises the pitch.
+
+    Returns:
+        The shifted samples, in the same dtype.
+    """
+    frames = samples.shape[0]
+    out_frames = max(1, round(frames / ratio))
+    positions = np.arange(out_frames) * (frames / out_frames)
+    source = np.arange(frames + 1)
+    wrapped = np.concatenate([samples, samples[:1]]).astype(np.float64)
+    shifted = np.stack(
+        [np.interp(positions, source, wrapped[:, c]) for c in range(samples.shape[1])],
+        axis=1,
+    )
+    info = np.iinfo(samples.dtype)
+    return np.clip(np.round(shifted), info.min, info.max).astype(samples.dtype)
+
+
+def build_bank(config: EngineSoundConfig):
+    """
+    Pitch shift the truck's recorded loops to each of the bank's engine
+    speeds, each from the recording nearest in pitch.
+
+    Returns:
+        The (frames, channels) samples of each bank loop, in the mixer's format.
+    """
+    recordings = [
+        (_mixer_samples(pygame.sndarray.array(ASSETS.sound(path))), rpm)
+        for path, rpm in config.loops
+    ]
+    bank = []
+    for rpm in bank_rpms(config):
+        samples, recorded_rpm = min(recordings, key=lambda r: abs(math.log(rpm / r[1])))
+        bank.append(pitch_shift(samples, rpm / recorded_rpm))
+    return bank
+
+
+def engine_bank_cache_path(
+    config: EngineSoundConfig, cache_dir: Path = ENGINE_BANK_CACHE_DIR
+):
+    """
+    Build the bank cache path for a truck's engine. The key is a hash of the
+    recorded loops, the bank's engine speeds and the mixer format, so editing
+    any of them automatically produces a new entry.
+
+    Args:
+        config: The truck's engine sound config.
+        cache_dir: The directory holding bank files.
+
+    Returns:
+        The path of the cache entry for this config.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"v{ENGINE_BANK_CACHE_VERSION}|{pygame.mixer.get_init()}".encode())
+    for path, rpm in config.loops:
+        digest.update(Path(path).read_bytes())
+        digest.update(f"|{rpm!r}|".encode())
+    digest.update(repr(bank_rpms(config)).encode())
+    return Path(cache_dir) / f"{digest.hexdigest()[:16]}.npz"
+
+
+def load_bank(
+    config: EngineSoundConfig, cache_dir: Path | None = ENGINE_BANK_CACHE_DIR
+):
+    """
+    Load a truck's engine bank, using the bank cache when possible. Missing or
+    corrupt entries are rebuilt and written back.
+
+    Args:
+        config: The truck's engine sound config.
+        cache_dir: The cache directory, or None to disable caching.
+
+    Returns:
+        A sound for each bank loop, lowest engine speed first.
+    """
+    if cache_dir is None:
+        bank = build_bank(config)
+    else:
+        cache_path = engine_bank_cache_path(config, cache_dir)
+        bank = _read_bank_cache(cache_path, config.bank_size)
+        if bank is None:
+            bank = build_bank(config)
+            _write_bank_cache(cache_path, bank)
+    return [pygame.sndarray.make_sound(np.ascontiguousarray(loop)) for loop in bank]
+
+
+def _mixer_samples(samples: np.ndarray):
+    # mono mixers give (frames,) arrays, keep a channel axis throughout
+    return samples.reshape(samples.shape[0], -1)
+
+
+def _read_bank_cache(cache_path: Path, bank_size: int):
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            bank = [data[f"loop_{i}"] for i in range(bank_size)]
+    except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+        return None
+    return bank
+
+
+def _write_bank_cache(cache_path: Path, bank: list[np.ndarray]):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # a unique temp file, so concurrent writers never share one
+        with tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            np.savez(f, **{f"loop_{i}": loop for i, loop in enumerate(bank)})
+        os.replace(f.name, cache_path)
+    except OSError:
+        # the cache is only an optimization, a read-only disk shouldn't stop the game
+        pass
+
+
+class EngineAudio:
+    """
+    Engine sound that follows the wheel speed. Every loop of the truck's bank
+    plays at once on its own channel, and each frame only the volumes of the
+    two loops either side of the engine speed change, crossfading between
+    them, so no audio is processed on the game thread. The bank is loaded, or
+    built the first time, on a background thread, and the engine is silent
+    until it's ready.
+    """
+
+    volume = 0.45
+    coast_volume = 0.6  # fraction of the volume off the throttle
+    throttle_response = 4.0  # 1/seconds, how fast the volume follows the throttle
+
+    def __init__(self, config: EngineSoundConfig):
+        self.config = config
+        self.rpms = bank_rpms(config)
+        self.start = ASSETS.sound(config.start)
+        self.start_ch = pygame.mixer.Channel(START_CHANNEL)
+        self.start_ch.set_volume(self.volume)
+
+        channels = FIRST_BANK_CHANNEL + len(self.rpms)
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        self.bank_chs = [
+            pygame.mixer.Channel(FIRST_BANK_CHANNEL + i) for i in range(len(self.rpms))
+        ]
+
+        self._bank: Future = _BANK_EXECUTOR.submit(load_bank, config)
+        self.bank: list[pygame.mixer.Sound] = None
+
+        self.running = False
+        self.bank_playing = False
+        self.wants_throttle = False
+        self.rpm = config.idle_rpm
+        self.load = self.coast_volume
+        self._volumes = [0.0] * len(self.rpms)
+
+    def start_engine(self):
+        if self.running:
+            return
+        self.start_ch.play(self.start)
+        self.running = True
+
+    def set_throttle(self, state: bool):
+        self.wants_throttle = state
+
+    def set_wheel_rpm(self, wheel_rpm: float):
+        """Set the engine speed from the driven wheels' speed in RPM."""
+        rpm = self.config.idle_rpm + abs(wheel_rpm) * self.config.gear_ratio
+        self.rpm = min(rpm, self.config.max_rpm)
+
+    def stop(self):
+        """Stop all engine sounds immediately and reset state."""
+        self.start_ch.stop()
+        for ch in self.bank_chs:
+            ch.stop()
+        self.running = False
+        self.bank_playing = False
+        self.wants_throttle = False
+        self.load = self.coast_volume
+        self._volumes = [0.0] * len(self.rpms)
+
+    def step(self, dt: float):
+        if not self.running or not self._play_bank():
+            return
+
+        target = 1.0 if self.wants_throttle else self.coast_volume
+        self.load += (target - self.load) * min(dt * self.throttle_response, 1.0)
+        # the start sound brings the engine up to idle
+        volume = 0.0 if self.start_ch.get_busy() else self.volume * self.load
+
+        volumes = self._crossfade(volume)
+        for ch, old, new in zip(self.bank_chs, self._volumes, volumes):
+            if new != old:
+                ch.set_volume(new)
+        self._volumes = volumes
+
+    def _play_bank(self):
+        """Start every bank loop, silent, once the bank is ready."""
+        if self.bank is None:
+            if not self._bank.done():
+                return False
+            self.bank = self._bank.result()
+        if not self.bank_playing:
+            for ch, loop in zip(self.bank_chs, self.bank):
+                ch.set_volume(0.0)
+                ch.play(loop, loops=-1)
+            self.bank_playing = True
+        return True
+
+    def _crossfade(self, volume: float):
+        """Equal power volumes of the two loops either side of the engine speed."""
+        i = bisect.bisect_right(self.rpms, self.rpm) - 1
+        i = min(max(i, 0), len(self.rpms) - 2)
+        low, high = self.rpms[i], self.rpms[i + 1]
+        t = min(max(math.log(self.rpm / low) / math.log(high / low), 0.0), 1.0)
+        volumes = [0.0] * len(self.rpms)
+        volumes[i] = volume * math.cos(t * math.pi / 2)
+        volumes[i + 1] = volume * math.sin(t * math.pi / 2)
+        return volumes
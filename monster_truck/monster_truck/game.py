@@ -1,209 +1,385 @@
 import math
+from datetime import datetime
 from enum import Enum
+from pathlib import Path
 
 import pygame
 from pymunk import Vec2d, Space, BB
 
+from monster_truck.assets import ASSETS, BackgroundLoader
 from monster_truck.config import *
-from monster_truck.rendering_utils import Camera, print_time
+from monster_truck.controllers import Controller, KeyboardController
+from monster_truck.engine_audio import EngineAudio
+from monster_truck.ghosts import (
+    GhostRecorder,
+    GhostRenderer,
+    GhostTrajectory,
+    ghost_path,
+    load_best_ghost,
+)
+from monster_truck.rendering_utils import (
+    Camera,
+    GlyphAtlas,
+    TerrainRenderer,
+    draw_world_layers,
+    load_level_texture,
+    print_time,
+)
+from monster_truck.level_loader import LevelPreloader, prepare_level
+from monster_truck.profiling import FrameProfiler, HitchLog, ProfilerOverlay
+from monster_truck.recording import RunRecording
+from monster_truck.terrain import Terrain, TerrainStreamer
 from monster_truck.truck import Truck
 from monster_truck.level_utils import (
     load_level_config,
     load_truck_config,
     level_units_to_world,
-    load_level_geometry_from_svg,
 )
 
 
-class ENGINE_STATES:
-    STOPPED = 0
-    IDLE = 1
-    ACCEL = 2
-    DECEL = 3
-    FULL_THROTTLE = 4
-
-
-class EngineSounds:
-    volume = 0.45
-    fade = 100
-
-    def __init__(self):
-        self.loop_ch = pygame.mixer.Channel(2)  # idle / full throttle loops
-        self.trans_ch = pygame.mixer.Channel(3)  # accel / decel transitions
-        self.loop_ch.set_volume(self.volume)
-        self.trans_ch.set_volume(self.volume)
-
-        self.start = pygame.mixer.Sound("assets/trucks/truck_1/sfx/truck_1_start.wav")
-        self.idle = pygame.mixer.Sound("assets/trucks/truck_1/sfx/truck_1_idle.wav")
-        self.accel = pygame.mixer.Sound("assets/trucks/truck_1/sfx/accelerate.wav")
-        self.full_throttle = pygame.mixer.Sound(
-            "assets/trucks/truck_1/sfx/full_throttle.wav"
-        )
-        self.decel = pygame.mixer.Sound("assets/trucks/truck_1/sfx/decelerate.wav")
-
-        self.state = ENGINE_STATES.STOPPED
-        self.wants_throttle = False
-        self.next_loop = self.idle
-
-    def start_engine(self):
-        if self.state != ENGINE_STATES.STOPPED:
-            return
-
-        self.loop_ch.play(self.start)
-        self.state = ENGINE_STATES.IDLE
-        self.next_loop = self.idle
-
-    def set_throttle(self, state: bool):
-        self.wants_throttle = state
-
-    def stop(self):
-        """Stop all engine sounds immediately and reset state."""
-        self.loop_ch.stop()
-        self.trans_ch.stop()
-        self.state = ENGINE_STATES.STOPPED
-        self.next_loop = self.idle
-        self.wants_throttle = False
-
-    def step(self, _):
-        # Handle throttle changes / transitions
-        if self.state in [ENGINE_STATES.IDLE, ENGINE_STATES.FULL_THROTTLE]:
-            if self.wants_throttle and self.state == ENGINE_STATES.IDLE:
-                self._play_transition(self.accel, self.full_throttle)
-                self.state = ENGINE_STATES.ACCEL
-            elif not self.wants_throttle and self.state == ENGINE_STATES.FULL_THROTTLE:
-                self._play_transition(self.decel, self.idle)
-                self.state = ENGINE_STATES.DECEL
-
-        if self.state == ENGINE_STATES.DECEL and self.wants_throttle:
-            self._play_transition(self.accel, self.full_throttle)
-            self.state = ENGINE_STATES.ACCEL
-        elif self.state == ENGINE_STATES.ACCEL and not self.wants_throttle:
-            self._play_transition(self.decel, self.idle)
-            self.state = ENGINE_STATES.DECEL
-
-        # **Restart loop channel if transition finished**
-        if not self.trans_ch.get_busy():
-            # Only restart if loop channel is not currently playing
-            if not self.loop_ch.get_busy():
-                self.loop_ch.play(self.next_loop, loops=-1)
-                # Update state to loop type
-                if self.next_loop == self.idle:
-                    self.state = ENGINE_STATES.IDLE
-                else:
-                    self.state = ENGINE_STATES.FULL_THROTTLE
-
-    def _play_transition(self, sound, next_loop):
-        if self.trans_ch.get_busy():
-            self.trans_ch.stop()
-
-        # Fade the loop channel slightly
-        self.loop_ch.fadeout(self.fade)
-
-        # Play the new transition
-        self.trans_ch.play(sound)
-
-        # Update which loop to return to
-        self.next_loop = next_loop
-
-
 class Game:
     screen_dims = (SCREEN_W, SCREEN_H)
     px_per_meter = PX_PER_METER
-
-    def __init__(self, clock: pygame.time.Clock):
-        self.sfx = EngineSounds()
+    sky_color = (174, 211, 250)
+    physics_hz = PHYSICS_HZ
+    max_substeps = MAX_PHYSICS_SUBSTEPS
+
+    def __init__(
+        self,
+        clock: pygame.time.Clock = None,
+        preloader: LevelPreloader | None = None,
+        headless: bool = False,
+        controller: Controller | None = None,
+        record_dir: str | Path | None = None,
+    ):
+        """
+        Args:
+            clock: The frame clock, used for the FPS readout.
+            preloader: Optional background loader to take levels from.
+            headless:
+                Run the physics only, without a display, audio, sprites or
+                HUD. Drive it with physics_step, see simulation.py.
+            controller:
+                Where driver inputs come from, the keyboard by default.
+            record_dir:
+                Save a run file of every run's inputs here, see recording.py.
+        """
+        self.headless = headless
+        self.controller = controller or KeyboardController()
+        self.preloader = preloader
+        self.profiler = FrameProfiler(
+            hitch_threshold=HITCH_THRESHOLD_MS / 1000,
+            hitch_log=None if headless else HitchLog(HITCH_LOG_PATH),
+        )
 
         self.level_config = load_level_config()
         self.truck_config = load_truck_config()
         self.default_start_position = Vec2d(0, 0)
+        # the HUD and the truck's sprites and sounds are loaded by load_hud and
+        # load_truck_assets, in the background when there's a loader
+        self.loader: BackgroundLoader = None
+        self.sfx: EngineAudio = None
 
         self.clock = clock
-        self.screen = pygame.display.set_mode(self.screen_dims)
+        self.screen = None
+        if not headless:
+            # reuse the window when the splash screen already opened it
+            self.screen = pygame.display.get_surface() or pygame.display.set_mode(
+                self.screen_dims
+            )
         self.camera = Camera(self.screen_dims, screen_scale=self.px_per_meter)
         self.finish_line = Vec2d(0, 0)
         self.level_time = 0
-
-        self.hud_font = pygame.font.SysFont("Arial", 18, bold=True)
+        self.accumulator = 0.0
+        self.input_direction = 0
+        self.flips = 0
+        self.resets = 0  # checkpoint resets this run
+        self._rotation = 0.0
+
+        # the inputs of the current run, only kept when saving them to record_dir
+        self.record_dir = Path(record_dir) if record_dir is not None else None
+        self.recording: RunRecording = None
+        self._truck_reset = False
+
+        # the best run on the current level and truck, raced as a ghost
+        self.ghost: GhostTrajectory = None
+        self.ghost_recorder: GhostRecorder = None
+        self.ghost_renderer: GhostRenderer = None
 
         self.space: Space = None
-        self.terrain_points: list[Vec2d] = []
+        self.terrain: Terrain = None
+        self.terrain_streamer: TerrainStreamer = None
+        self.terrain_renderer: TerrainRenderer = None
+        self.backgrounds = []
+        self.loaded_level_config: LevelConfig = None
+        self.level_hash: bytes = None  # see config_hash
         self.truck: Truck = None
 
         self.checkpoints = []
         self.checkpoint_i = 0
 
-        self.hud = HUD()
+        self.hud_font = None
+        self.hud: HUD = None
+        self.profiler_overlay: ProfilerOverlay = None
+        self.show_profiler = False
 
-    def init(self):
-        self.space = Space()
-        self.space.gravity = self.level_config.gravity
-
-        self.terrain_points = load_level_geometry_from_svg(
-            self.space,
-            self.level_config.svg_path,
-            self.level_config.units_per_meter,
-            self.level_config.samples_per_meter,
-            self.level_config.ground_friction,
+    def load_hud(self):
+        """Load the HUD's font. Does nothing once loaded."""
+        if self.headless or self.hud is not None:
+            return
+        self.hud_font = pygame.font.SysFont("Arial", 18, bold=True)
+        self.hud = HUD(self.hud_font)
+
+    def preload_truck_assets(self):
+        """
+        Read and decode the selected truck's sprites and engine sounds into the
+        asset cache. Safe to run on a background thread, the sprites are
+        converted by load_truck_assets.
+        """
+        if self.headless:
+            return
+        config = self.truck_config
+        for path in self._truck_sprite_paths():
+            ASSETS.image(path)
+        sounds = config.engine_sounds
+        for path in (sounds.start, *(path for path, _ in sounds.loops)):
+            ASSETS.sound(path)
+
+    def load_truck_assets(self):
+        """
+        Load the selected truck's sprites and engine sounds, so starting a run
+        doesn't wait on them. Does nothing once loaded. Must run on the main
+        thread.
+        """
+        if self.headless:
+            return
+        for path in self._truck_sprite_paths():
+            ASSETS.image(path)
+        if self.sfx is None:
+            self.sfx = EngineAudio(self.truck_config.engine_sounds)
+
+    def _truck_sprite_paths(self):
+        config = self.truck_config
+        return (
+            config.chassis.sprite_path,
+            config.wheel_rear.sprite_path,
+            config.wheel_front.sprite_path,
         )
 
+    def loading_progress(self):
+        """The fraction of the background loading done, 1 with nothing loading."""
+        return 1.0 if self.loader is None else self.loader.progress
+
+    def init(self):
+        if self.loader is not None:
+            # anything still loading in the background is needed now
+            self.loader.wait()
+        self.load_hud()
+        self.load_truck_assets()
+
+        if self.preloader is not None:
+            prepared = self.preloader.take(self.level_config)
+        else:
+            prepared = prepare_level(self.level_config)
+        previous_level = self.loaded_level_config
+        self.space = prepared.space
+        self.level_hash = prepared.level_hash
+        self.terrain = prepared.terrain
+        self.terrain_streamer = prepared.streamer
+        self.loaded_level_config = prepared.config
+        if not self.headless:
+            self.terrain_renderer = TerrainRenderer(self.terrain)
+            scope = _level_scope(self.level_config)
+            self.backgrounds = [
+                load_level_texture(
+                    bg.sprite_path,
+                    bg.dimensions,
+                    bg.position,
+                    tile=bg.tile_dimensions is not None,
+                    tile_size=bg.tile_dimensions,
+                    parallax=bg.parallax,
+                    scope=scope,
+                )
+                for bg in self.level_config.backgrounds
+            ]
+            if previous_level is not None and previous_level != self.level_config:
+                ASSETS.unload(_level_scope(previous_level))
+
         pos = Vec2d(self.level_config.start_position, 0)
         pos = self._to_world(pos)
         self.default_start_position = self._get_truck_pos(pos.x)
 
-        self.finish_line = self._to_world(Vec2d(self.level_config.finish_line, 0))
+        self.finish_line = self._surface_at(self.level_config.finish_line)
 
         self.checkpoints = [self.default_start_position] + [
-            self._to_world(Vec2d(x, 0)) for x in self.level_config.checkpoints
+            self._surface_at(x) for x in self.level_config.checkpoints
         ]
 
-        self.truck = Truck(
-            self.truck_config,
-            self.space,
-            self.default_start_position,
-        )
+        self._start_run()
 
-    def reset_truck(self):
-        self.truck = Truck(
-            self.truck_config,
-            self.space,
-            self._get_truck_pos(self.checkpoints[self.checkpoint_i].x),
-        )
+    def restart(self):
+        """
+        Restart the current level from the start. The static terrain stays in
+        the space and only the truck is rebuilt, so this is much cheaper than
+        init. Falls back to init if the selected level has changed.
+        """
+        if self.space is None or self.level_config is not self.loaded_level_config:
+            self.init()
+            return
 
-    def step(self, dt: float):
-        self.space.step(dt)
+        self._start_run()
+
+    def _start_run(self):
+        self.save_recording()
+        if self.record_dir is not None:
+            self.recording = RunRecording.start(
+                self.level_config, self.truck_config, self.physics_hz, self.level_hash
+            )
+        self._truck_reset = False
+        self.resets = 0
+        self.level_time = 0
+        self.accumulator = 0.0
+        self.checkpoint_i = 0
+        self.flips = 0
+        self._rotation = 0.0
+        self._stream_terrain(self.default_start_position.x)
+
+        if (
+            self.truck is not None
+            and self.truck.space is self.space
+            and self.truck.config is self.truck_config
+        ):
+            self.truck.reset(self.default_start_position)
+        else:
+            if self.truck is not None and self.truck.space is self.space:
+                self.truck.remove()
+            self.truck = Truck(
+                self.truck_config,
+                self.space,
+                self.default_start_position,
+                load_sprites=not self.headless,
+            )
 
-        keys = pygame.key.get_pressed()
-        self.camera.base_pos = self.truck.chassis_body.position
+        if not self.headless:
+            if self.sfx.config is not self.truck_config.engine_sounds:
+                self.sfx.stop()
+                self.sfx = EngineAudio(self.truck_config.engine_sounds)
+            self._start_ghost()
+
+    def select_level(self, config: LevelConfig):
+        """
+        Select the level to start next. A level that has been played before is
+        prepared again in the background, so starting it doesn't wait on it.
+        """
+        self.level_config = config
+        if self.preloader is not None:
+            self.preloader.prepare(config)
+
+    def is_level_ready(self):
+        """
+        Whether the selected level can start without blocking on loading,
+        its terrain or the game's background loading.
+        """
+        if self.loader is not None and not self.loader.ready:
+            return False
+        return self.preloader is None or self.preloader.is_ready(self.level_config)
 
-        input_direction = 0
-        if keys[pygame.K_RIGHT]:
-            input_direction = -1
-        elif keys[pygame.K_LEFT]:
-            input_direction = 1
+    def reset_truck(self):
+        position = self._get_truck_pos(self.checkpoints[self.checkpoint_i].x)
+        self._stream_terrain(position.x)
+        self.truck.reset(position)
+        self._truck_reset = True
+        self.resets += 1
 
-        self.truck.motor.update_target(input_direction, keys[pygame.K_SPACE])
-        self.truck.motor.step()
+    def step(self, dt: float):
+        # PHYSICS
+        # Physics always advances in fixed steps, so results don't depend on
+        # the frame rate. Time beyond max_substeps is dropped rather than
+        # trying to catch up after a long frame.
+        physics_dt = 1 / self.physics_hz
+        self.accumulator = min(self.accumulator + dt, physics_dt * self.max_substeps)
+        finished = False
+        with self.profiler.phase("physics"):
+            while self.accumulator >= physics_dt and not finished:
+                self.accumulator -= physics_dt
+                finished = self.physics_step(physics_dt)
+
+        if finished:
+            self._save_ghost()
+            return MENU_STATE.GAME_OVER
+
+        # blend between the last two physics states by the leftover time
+        alpha = self.accumulator / physics_dt
+        self.camera.base_pos = self.truck.interpolated_pose(
+            self.truck.chassis_body, alpha
+        )[0]
 
         # DRAWING
-        self.screen.fill((174, 211, 250))
-        color = (173, 144, 127)
-        if len(self.terrain_points) >= 2:
-            points_px = [self.camera.to_screen_coords(pt) for pt in self.terrain_points]
-            pygame.draw.lines(self.screen, color, False, points_px, 3)
-        self.truck.draw(self.screen, self.camera)
+        with self.profiler.phase("terrain"):
+            self.screen.fill(self.sky_color)
+            draw_world_layers(self.screen, self.backgrounds, self.camera)
+            self.terrain_renderer.draw(self.screen, self.camera)
+        with self.profiler.phase("truck"):
+            if self.ghost is not None:
+                # the ghost is drawn at the same interpolated time as the truck
+                self._draw_ghost(self.level_time - (1 - alpha) * physics_dt)
+            self.truck.draw(self.screen, self.camera, alpha)
 
         # Draw HUD
-        self.hud.step(dt, self.truck, self.clock.get_fps())
-        metrics = [
-            f"Time: {print_time(self.level_time)}",
-            f"FPS: {int(self.hud.display_fps)}",
-            f"Speed: {self.hud.display_speed:.1f} m/s",
-            f"Front RPM: {int(self.hud.display_rpm_f)}",
-            f"Rear RPM: {int(self.hud.display_rpm_r)}",
-        ]
-        for i, text in enumerate(metrics):
-            surf = self.hud_font.render(text, True, (0, 0, 0))
-            self.screen.blit(surf, (20, 20 + i * 25))
+        with self.profiler.phase("hud"):
+            self.hud.step(dt, self.truck, self.clock.get_fps(), self.level_time)
+            self.hud.draw(self.screen)
+
+        if self.show_profiler:
+            with self.profiler.phase("profiler"):
+                self.draw_profiler()
+
+        with self.profiler.phase("flip"):
+            pygame.display.flip()
+
+        with self.profiler.phase("engine_audio"):
+            self.sfx.start_engine()  # always call this, but will only trigger once
+            self.sfx.set_throttle(self.input_direction != 0)
+            self.sfx.set_wheel_rpm(self.truck.wheel_rpm[1])
+            self.sfx.step(dt)
+
+        return MENU_STATE.RUN_GAME
+
+    def toggle_profiler(self):
+        """Turn the frame profiler, its overlay and the hitch log on or off."""
+        self.show_profiler = not self.show_profiler
+        self.profiler.enabled = self.show_profiler
+
+    def draw_profiler(self):
+        if self.profiler_overlay is None:
+            font = pygame.font.SysFont("Arial", 14, bold=True)
+            self.profiler_overlay = ProfilerOverlay(font, self.profiler)
+        self.profiler_overlay.draw(self.screen)
+
+    def physics_step(self, dt: float):
+        """
+        Read the controller and advance the simulation by one fixed step.
+
+        Returns:
+            True if the truck crossed the finish line.
+        """
+        if self.controller.should_reset():
+            self.reset_truck()
+        direction, braking = self.controller.read(self.level_time)
+        if self.recording is not None:
+            self.recording.append(direction, braking, self._truck_reset)
+        self._truck_reset = False
+        self.input_direction = direction
+        self.truck.motor.update_target(direction, braking)
+
+        self._stream_terrain(self.truck.chassis_body.position.x)
+        self.truck.store_pose()
+        self.truck.motor.step()
+        self.space.step(dt)
+        self.level_time += dt
+        self._count_flips()
+        if self.ghost_recorder is not None:
+            self.ghost_recorder.step()
 
         # CHECKPOINTS / FINISH LINE
         truck_bb = self.truck.bb
@@ -211,66 +387,165 @@ class Game:
             if truck_bb.right >= self.checkpoints[self.checkpoint_i + 1].x:
                 self.checkpoint_i += 1
 
-        if truck_bb.right >= self.finish_line.x:
-            return MENU_STATE.GAME_OVER
-
-        pygame.display.flip()
-
-        self.level_time += dt
+        finished = truck_bb.right >= self.finish_line.x
+        if self.recording is not None:
+            self.recording.completed = finished
+        return finished
+
+    def save_recording(self):
+        """
+        Save the current run's inputs to record_dir, if recording.
+
+        Returns:
+            The path of the saved run file, or None.
+        """
+        if self.record_dir is None or not self.recording:
+            return None
+
+        # microseconds, so runs saved within a second don't overwrite each other
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = "".join(c if c.isalnum() else "_" for c in self.recording.level)
+        path = self.record_dir / f"{stamp}-{name}.run"
+        self.recording.save(path)
+        return path
+
+    def _start_ghost(self):
+        """Load the ghost to race and start recording this run's poses."""
+        if self.ghost is None or not self.ghost.matches(
+            self.level_hash, self.truck_config
+        ):
+            self.ghost = load_best_ghost(
+                self.level_config, self.truck_config, self.level_hash
+            )
+        self.ghost_recorder = GhostRecorder(self.truck.bodies, self.physics_hz)
 
-        self.sfx.start_engine()  # always call this, but will only trigger once
-        self.sfx.set_throttle(input_direction != 0)
-        self.sfx.step(dt)
+    def _save_ghost(self):
+        """Keep the finished run as the ghost to race if it set a best time."""
+        if self.ghost_recorder is None:
+            return
+        if self.ghost is not None and self.ghost.completion_time <= self.level_time:
+            return
 
-        return MENU_STATE.RUN_GAME
+        self.ghost = self.ghost_recorder.trajectory(
+            self.level_config, self.truck_config, self.level_hash, self.level_time
+        )
+        self.ghost.save(ghost_path(self.level_config, self.truck_config))
+
+    def _draw_ghost(self, ghost_time: float):
+        if (
+            self.ghost_renderer is None
+            or self.ghost_renderer.config is not self.truck_config
+        ):
+            self.ghost_renderer = GhostRenderer(self.truck_config)
+        poses = self.ghost.pose_at(ghost_time)
+        self.ghost_renderer.draw(self.screen, self.camera, poses)
+
+    def _count_flips(self):
+        # accumulate chassis rotation, a full turn either way is one flip
+        prev_angle = self.truck.prev_poses[self.truck.chassis_body][1]
+        self._rotation += self.truck.chassis_body.angle - prev_angle
+        if abs(self._rotation) >= 2 * math.pi:
+            self.flips += 1
+            self._rotation -= math.copysign(2 * math.pi, self._rotation)
 
     def _to_world(self, pos: Vec2d):
         return level_units_to_world(pos, self.level_config.units_per_meter)
 
+    def _stream_terrain(self, x: float):
+        if self.terrain_streamer is not None:
+            self.terrain_streamer.update(x)
+
+    def _surface_at(self, level_x: float):
+        """The ground position under a level SVG relative x coordinate."""
+        x = self._to_world(Vec2d(level_x, 0)).x
+        return Vec2d(x, self.terrain.height_at(x))
+
     def _get_truck_pos(self, x_axis: float):
-        points: list[Vec2d] = []
-        for i, current in enumerate(self.terrain_points):
-            if i >= len(self.terrain_points) - 1:
-                continue
-            next = self.terrain_points[i + 1]
-            if (current.x <= x_axis and next.x >= x_axis) or (
-                current.x >= x_axis and next.x <= x_axis
-            ):
-                points.append(current)
-                points.append(next)
-
-        print(points)
-        if len(points) == 0:
-            raise Exception(
-                f"x-axis position {x_axis} does not intersect with ground plane."
-            )
+        half_width = self.truck_config.chassis.dimensions.x / 2
+        return self.terrain.highest_surface_at(x_axis, half_width) + Vec2d(0, 5)
 
-        highest = points.pop()
-        while len(points) > 0:
-            p = points.pop()
-            if p.y > highest.y:
-                highest = p
 
-        print("highest", highest)
-        return highest + Vec2d(0, 5)
+def _level_scope(level: LevelConfig):
+    """The asset scope for assets only a single level uses."""
+    return f"level:{level.name}"
 
 
 class HUD:
-    def __init__(self):
+    """
+    A retained heads up display. The readouts only change every
+    update_interval seconds (or when the displayed time ticks over), so the
+    HUD is composited into one surface when they do, and otherwise costs a
+    single blit per frame. Numbers are drawn from a glyph atlas, so only the
+    static labels ever go through the font rasterizer.
+    """
+
+    color = (0, 0, 0)
+    position = (20, 20)
+    line_height = 25
+    labels = ["Time: ", "FPS: ", "Speed: ", "Front RPM: ", "Rear RPM: "]
+    units = ["", "", " m/s", "", ""]
+
+    def __init__(self, font: pygame.font.Font):
         self.update_interval = 0.25
         self.timer = 0.0
+        self.display_time = 0.0
         self.display_fps = 0.0
         self.display_speed = 0.0
         self.display_rpm_f = 0.0
         self.display_rpm_r = 0.0
 
-    def step(self, dt: float, truck: Truck, fps):
+        self.atlas = GlyphAtlas(font, self.color)
+        self.label_surfs = [font.render(t, True, self.color) for t in self.labels]
+        self.unit_surfs = [font.render(t, True, self.color) for t in self.units]
+        self.surface: pygame.Surface = None
+        self.dirty = True
+        self._values: list[str] = []
+
+    def step(self, dt: float, truck: Truck, fps, level_time: float = 0.0):
         self.timer += dt
 
         if self.timer >= self.update_interval:
             self.display_speed = truck.chassis_body.velocity.length
-            rad_to_rpm = 60 / (2 * math.pi)
-            self.display_rpm_f = -truck.wheel_front_body.angular_velocity * rad_to_rpm
-            self.display_rpm_r = -truck.wheel_rear_body.angular_velocity * rad_to_rpm
+            self.display_rpm_f, self.display_rpm_r = truck.wheel_rpm
             self.display_fps = fps
             self.timer = 0.0
+
+        self.display_time = level_time
+        values = [
+            print_time(self.display_time),
+            str(int(self.display_fps)),
+            f"{self.display_speed:.1f}",
+            str(int(self.display_rpm_f)),
+            str(int(self.display_rpm_r)),
+        ]
+        if values != self._values:
+            self._values = values
+            self.dirty = True
+
+    def draw(self, screen: pygame.Surface):
+        if self.dirty or self.surface is None:
+            self._compose()
+        screen.blit(self.surface, self.position)
+
+    def _compose(self):
+        lines = list(zip(self.label_surfs, self._values, self.unit_surfs))
+        width = max(
+            label.get_width() + self.atlas.width(value) + unit.get_width()
+            for label, value, unit in lines
+        )
+        height = self.line_height * (len(lines) - 1) + self.atlas.height
+        # only reallocate when the readouts outgrow the current surface
+        if (
+            self.surface is None
+            or self.surface.get_width() < width
+            or self.surface.get_height() < height
+        ):
+            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+
+        for i, (label, value, unit) in enumerate(lines):
+            y = i * self.line_height
+            self.surface.blit(label, (0, y))
+            x = self.atlas.draw(self.surface, value, (label.get_width(), y))
+            self.surface.blit(unit, (x, y))
+        self.dirty = False
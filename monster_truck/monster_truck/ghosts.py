@@ -0,0 +1,256 @@
+import math
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pygame
+import pymunk
+
+from monster_truck.assets import ASSETS
+from monster_truck.config import GHOST_DIR
+from monster_truck.configs.interfaces import LevelConfig, TruckConfig
+from monster_truck.recording import config_hash
+from monster_truck.rendering_utils import Camera, SpriteRenderable, draw_sprite
+
+GHOST_KEYFRAME_HZ = 30
+
+
+class GhostTrajectory:
+    """
+    The chassis, rear and front wheel poses of a run, sampled at keyframe_hz
+    and interpolated in between. A ghost has no physics bodies, it only
+    replays the poses.
+
+    On disk the poses are delta encoded float32 arrays in a compressed npz, a
+    minute of driving takes a few tens of kilobytes.
+
+    Attributes:
+        level: The name of the level the run was driven on.
+        truck: The name of the truck that was driven.
+        level_hash: Fingerprint of the level config, see config_hash.
+        truck_hash: Fingerprint of the truck config, see config_hash.
+        keyframe_hz: Pose samples per simulated second.
+        poses:
+            (n, 3, 3) keyframes of (x, y, angle) per body. Angles are kept
+            within one turn, wheels spin far enough over a run for float32 to
+            lose precision otherwise.
+        completion_time: (seconds) The run's finish time.
+    """
+
+    def __init__(
+        self,
+        level: str,
+        truck: str,
+        level_hash: bytes,
+        truck_hash: bytes,
+        keyframe_hz: float,
+        poses: np.ndarray,
+        completion_time: float,
+    ):
+        self.level = level
+        self.truck = truck
+        self.level_hash = level_hash
+        self.truck_hash = truck_hash
+        self.keyframe_hz = keyframe_hz
+        self.poses = poses
+        self.completion_time = completion_time
+
+    def __len__(self):
+        return len(self.poses)
+
+    def matches(self, level_hash: bytes, truck: TruckConfig):
+        """
+        Whether the ghost was driven on this level with this truck.
+
+        Args:
+            level_hash: The level's config_hash.
+            truck: The truck config.
+        """
+        return self.level_hash == level_hash and self.truck_hash == config_hash(truck)
+
+    def pose_at(self, t: float):
+        """
+        The interpolated body poses at a time into the run, held at the last
+        keyframe once the run is over.
+
+        Args:
+            t: (seconds) Simulated time since the run started.
+
+        Returns:
+            (3, 3) array of (x, y, angle) for the chassis, rear and front
+            wheels.
+        """
+        f = min(max(t * self.keyframe_hz, 0.0), len(self.poses) - 1)
+        i = int(f)
+        if i + 1 >= len(self.poses):
+            return self.poses[i]
+        start = self.poses[i]
+        delta = self.poses[i + 1] - start
+        # turn the short way round when an angle wraps between keyframes
+        delta[:, 2] = (delta[:, 2] + math.pi) % (2 * math.pi) - math.pi
+        return start + delta * (f - i)
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # a unique temp file, so concurrent writers never share one
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, suffix=".tmp", delete=False
+        ) as f:
+            np.savez_compressed(
+                f,
+                level=np.array(self.level),
+                truck=np.array(self.truck),
+                level_hash=np.frombuffer(self.level_hash, dtype=np.uint8),
+                truck_hash=np.frombuffer(self.truck_hash, dtype=np.uint8),
+                keyframe_hz=np.array(self.keyframe_hz),
+                completion_time=np.array(self.completion_time),
+                deltas=_delta_encode(self.poses),
+            )
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: str | Path):
+        """
+        Read a ghost file.
+
+        Returns:
+            The ghost, or None if it is missing or unreadable.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(
+                    str(data["level"]),
+                    str(data["truck"]),
+                    data["level_hash"].tobytes(),
+                    data["truck_hash"].tobytes(),
+                    float(data["keyframe_hz"]),
+                    np.cumsum(data["deltas"], axis=0, dtype=np.float32),
+                    float(data["completion_time"]),
+                )
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+
+def _delta_encode(poses: np.ndarray):
+    """
+    Difference each keyframe against the previous one as decoded, so rounding
+    to float32 doesn't accumulate along the run when summed back up.
+    """
+    deltas = np.empty(poses.shape, dtype=np.float32)
+    decoded = np.zeros(poses.shape[1:], dtype=np.float32)
+    for i, pose in enumerate(poses):
+        deltas[i] = pose - decoded
+        decoded += deltas[i]
+    return deltas
+
+
+def ghost_path(level: LevelConfig, truck: TruckConfig, ghost_dir=GHOST_DIR):
+    """Where the best ghost for a level and truck pair is stored."""
+    name = f"{level.name}--{truck.name}"
+    name = "".join(c if c.isalnum() or c == "-" else "_" for c in name)
+    return Path(ghost_dir) / f"{name}.npz"
+
+
+def load_best_ghost(
+    level: LevelConfig, truck: TruckConfig, level_hash: bytes, ghost_dir=GHOST_DIR
+):
+    """
+    The stored best ghost for a level and truck pair, or None if there is no
+    ghost or it was driven on an older version of the level or truck.
+
+    Args:
+        level: The level config.
+        truck: The truck config.
+        level_hash: The level's config_hash.
+        ghost_dir: The directory holding ghost files.
+    """
+    ghost = GhostTrajectory.load(ghost_path(level, truck, ghost_dir))
+    if ghost is None or not ghost.matches(level_hash, truck):
+        return None
+    return ghost
+
+
+class GhostRecorder:
+    """Samples a truck's body poses every few physics steps during a run."""
+
+    def __init__(
+        self,
+        bodies: tuple[pymunk.Body, ...],
+        physics_hz: int,
+        keyframe_hz: float = GHOST_KEYFRAME_HZ,
+    ):
+        self.bodies = bodies
+        self.interval = max(1, round(physics_hz / keyframe_hz))
+        self.keyframe_hz = physics_hz / self.interval
+        self.steps = 0
+        self.poses: list[tuple[float, ...]] = []
+        self._sample()
+
+    def step(self):
+        """Call after each physics step."""
+        self.steps += 1
+        if self.steps % self.interval == 0:
+            self._sample()
+
+    def trajectory(
+        self,
+        level: LevelConfig,
+        truck: TruckConfig,
+        level_hash: bytes,
+        completion_time: float,
+    ):
+        """
+        The recorded run as a ghost.
+
+        Args:
+            level: The level the run was driven on.
+            truck: The truck that was driven.
+            level_hash: The level's config_hash.
+            completion_time: (seconds) The run's finish time.
+        """
+        poses = np.array(self.poses, dtype=np.float64)
+        poses = poses.reshape(-1, len(self.bodies), 3)
+        return GhostTrajectory(
+            level.name,
+            truck.name,
+            level_hash,
+            config_hash(truck),
+            self.keyframe_hz,
+            poses,
+            completion_time,
+        )
+
+    def _sample(self):
+        pose = []
+        for body in self.bodies:
+            pose += [body.position.x, body.position.y, body.angle % (2 * math.pi)]
+        self.poses.append(pose)
+
+
+class GhostRenderer:
+    """
+    Draws a ghost with translucent copies of a truck's sprites. The sprites
+    have their own rotation caches, so a ghost costs about as much to draw as
+    the truck.
+    """
+
+    alpha = 110
+
+    def __init__(self, truck: TruckConfig):
+        self.config = truck
+        self.renderables = [
+            self._load_sprite(part.sprite_path, part.dimensions)
+            for part in (truck.chassis, truck.wheel_rear, truck.wheel_front)
+        ]
+
+    def draw(self, screen: pygame.Surface, camera: Camera, poses: np.ndarray):
+        for renderable, (x, y, angle) in zip(self.renderables, poses):
+            draw_sprite(screen, renderable, camera, pymunk.Vec2d(x, y), angle)
+
+    def _load_sprite(self, path: str, size_m: pymunk.Vec2d):
+        # the truck sprites are shared, so fade a copy
+        sprite = ASSETS.image(path).copy()
+        sprite.fill((255, 255, 255, self.alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        return SpriteRenderable(sprite, size_m)
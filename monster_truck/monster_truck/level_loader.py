@@ -0,0 +1,137 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from pymunk import Space
+
+from monster_truck.configs.interfaces import LevelConfig
+from monster_truck.level_utils import (
+    create_terrain_segments,
+    load_level_points,
+)
+from monster_truck.recording import config_hash
+from monster_truck.terrain import SurfaceIndex, Terrain, TerrainStreamer
+
+
+@dataclass
+class PreparedLevel:
+    """
+    Everything a level needs before the truck is added, ready to be attached
+    to a Game.
+
+    Attributes:
+        config: The level config this was prepared from.
+        space: A physics space holding only the static terrain.
+        terrain: The indexed terrain geometry.
+        level_hash:
+            The level's config_hash. It reads the level's SVG, so it's worked
+            out once here rather than on every start.
+        streamer:
+            The terrain streamer when the level streams its terrain, in which
+            case no terrain has been added to the space yet.
+    """
+
+    config: LevelConfig
+    space: Space
+    terrain: Terrain
+    level_hash: bytes
+    streamer: TerrainStreamer | None = None
+
+
+def prepare_level(config: LevelConfig):
+    """
+    Load a level's terrain and build its static physics space.
+
+    Args:
+        config: The level to prepare.
+
+    Returns:
+        The prepared level.
+    """
+    space = Space()
+    space.gravity = config.gravity
+
+    points = load_level_points(
+        config.svg_path,
+        config.units_per_meter,
+        config.samples_per_meter,
+        config.tessellation_tolerance,
+    )
+    # every segment's surface is resolved here, once per load
+    terrain = Terrain(points, SurfaceIndex.from_level(config))
+
+    streamer = None
+    if config.stream_chunk_width:
+        streamer = TerrainStreamer(
+            space,
+            terrain,
+            config.stream_chunk_width,
+            config.stream_window,
+        )
+    else:
+        space.add(
+            *create_terrain_segments(
+                space.static_body,
+                terrain.points,
+                terrain.frictions,
+                terrain.segment_colors(),
+            )
+        )
+    return PreparedLevel(config, space, terrain, config_hash(config), streamer)
+
+
+class LevelPreloader:
+    """
+    Prepares levels on a background thread so starting one only has to attach
+    the ready space and terrain. Each prepared level can be taken once. It is
+    only prepared again when asked to, when the level is next chosen, so no
+    level is rebuilt in the background while one is being played.
+    """
+
+    def __init__(self, levels: list[LevelConfig]):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="level-preloader"
+        )
+        self._futures: dict[int, Future] = {}
+        for level in levels:
+            self._submit(level)
+
+    def is_ready(self, config: LevelConfig):
+        """Whether a level can be taken without waiting on the loader."""
+        future = self._futures.get(id(config))
+        return future is None or future.done()
+
+    def take(self, config: LevelConfig):
+        """
+        Take the prepared level, waiting for it if it is still loading. Levels
+        that were never submitted are prepared on the calling thread.
+
+        Args:
+            config: The level to take.
+
+        Returns:
+            The prepared level.
+        """
+        future = self._futures.get(id(config))
+        if future is None:
+            return prepare_level(config)
+
+        prepared = future.result()
+        del self._futures[id(config)]
+        return prepared
+
+    def prepare(self, config: LevelConfig):
+        """Prepare a level in the background, unless it already is or has been."""
+        if id(config) not in self._futures:
+            self._submit(config)
+
+    def wait(self):
+        """Wait until every level submitted so far is prepared."""
+        for future in list(self._futures.values()):
+            future.result()
+
+    def shutdown(self):
+        """Stop the loader thread, dropping anything not yet started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, config: LevelConfig):
+        self._futures[id(config)] = self._executor.submit(prepare_level, config)
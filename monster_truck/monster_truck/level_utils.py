@@ -1,11 +1,28 @@
+import cmath
+import glob
+import hashlib
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
 from xml.dom import minidom
 
-from pymunk import Vec2d, Space, Segment
+import numpy as np
+from pymunk import Vec2d, Space, Segment, Body
 from svg.path import parse_path, Move, CubicBezier, Line
 
 from monster_truck.config import *
 
 
+# Compiled terrain is cached on disk so level restarts can skip SVG parsing and
+# curve sampling entirely. Bump the version whenever sampling output changes.
+TERRAIN_CACHE_DIR = Path(".cache/terrain")
+TERRAIN_CACHE_VERSION = 2
+
+TERRAIN_SEGMENT_RADIUS = 0.2
+
+
 def load_svg(filepath: str):
     """
     Load a filepath, and parse the SVG paths command strings.
@@ -86,6 +103,212 @@ def sample_paths(
     return points
 
 
+def sample_paths_array(
+    paths: list[str],
+    level_to_world_units: float,
+    samples_per_world_unit: int,
+):
+    """
+    Vectorized version of sample_paths. The path commands are gathered into
+    one array of cubic control points, and every sample of every segment is
+    evaluated at once with the Bernstein form of the cubic. Lines and moves
+    are treated as degenerate cubics sampled only at their endpoint, so the
+    output matches sample_paths point for point.
+
+    Args:
+        paths: The array of individual path strings to sample.
+        level_to_world_units: The number of input file units per world unit.
+        samples_per_world_unit:
+            The target number of samples per world unit along curves.
+
+    Returns:
+        An (N, 2) float64 array of sampled points in world-relative units.
+    """
+    # currently we only support a single contiguous vector path.
+    controls: list[tuple[complex, complex, complex, complex]] = []
+    is_curve: list[bool] = []
+    for cmd in parse_path(paths[0]):
+        if isinstance(cmd, (Move, Line)):
+            controls.append((cmd.end, cmd.end, cmd.end, cmd.end))
+            is_curve.append(False)
+        elif isinstance(cmd, CubicBezier):
+            controls.append((cmd.start, cmd.control1, cmd.control2, cmd.end))
+            is_curve.append(True)
+
+    ctrl = np.array(controls, dtype=np.complex128).reshape(-1, 4)
+    is_curve = np.array(is_curve, dtype=bool)
+
+    # approximate each curve length from its control polygon, like sample_paths
+    length = (
+        np.abs(ctrl[:, 0] - ctrl[:, 1])
+        + np.abs(ctrl[:, 1] - ctrl[:, 2])
+        + np.abs(ctrl[:, 2] - ctrl[:, 3])
+    ) / level_to_world_units
+    num_samples = np.maximum(2, (length * samples_per_world_unit).astype(np.int64))
+    # curves take samples 1..n-1 of n, lines and moves take only t=1.
+    denom = np.where(is_curve, num_samples, 1)
+    counts = np.where(is_curve, num_samples - 1, 1)
+
+    seg = np.repeat(np.arange(len(ctrl)), counts)
+    offsets = np.cumsum(counts) - counts
+    k = np.arange(len(seg)) - np.repeat(offsets, counts) + 1
+    t = k / denom[seg]
+    mt = 1.0 - t
+
+    p0, p1, p2, p3 = (ctrl[seg, i] for i in range(4))
+    pts = mt**3 * p0 + 3 * mt**2 * t * p1 + 3 * mt * t**2 * p2 + t**3 * p3
+
+    # flip Y (SVG is +Y down) and scale into world units in one pass
+    points = np.empty((len(pts), 2), dtype=np.float64)
+    points[:, 0] = pts.real
+    points[:, 1] = -pts.imag
+    points /= level_to_world_units
+    return points
+
+
+def tessellate_paths_array(
+    paths: list[str],
+    level_to_world_units: float,
+    tolerance: float,
+    max_depth: int = 16,
+):
+    """
+    Adaptively tessellate SVG path strings. Each curve is recursively split in
+    half until its control points are within half the tolerance of the chord,
+    then runs of nearly collinear points are merged while staying within the
+    other half, so the final polyline is within tolerance of the true curve.
+    Flat stretches collapse to a handful of long segments and tight curves get
+    as many as they need.
+
+    Args:
+        paths: The array of individual path strings to tessellate.
+        level_to_world_units: The number of input file units per world unit.
+        tolerance: (world units) The maximum allowed chord error.
+        max_depth: The maximum number of times a single curve is halved.
+
+    Returns:
+        An (N, 2) float64 array of points in world-relative units.
+    """
+    flatness = tolerance / 2
+
+    def to_world(pt: complex):
+        # flip Y, since input files are +Y down and the physics world is +Y up
+        return pt.conjugate() / level_to_world_units
+
+    points: list[complex] = []
+    # currently we only support a single contiguous vector path.
+    for cmd in parse_path(paths[0]):
+        if isinstance(cmd, (Move, Line)):
+            points.append(to_world(cmd.end))
+        elif isinstance(cmd, CubicBezier):
+            stack = [
+                (
+                    to_world(cmd.start),
+                    to_world(cmd.control1),
+                    to_world(cmd.control2),
+                    to_world(cmd.end),
+                    0,
+                )
+            ]
+            # depth first, always expanding the left half first, so the emitted
+            # endpoints come out in path order.
+            while stack:
+                p0, p1, p2, p3, depth = stack.pop()
+                if depth >= max_depth or (
+                    _distance_to_chord(p1, p0, p3) <= flatness
+                    and _distance_to_chord(p2, p0, p3) <= flatness
+                ):
+                    points.append(p3)
+                    continue
+                # de Casteljau split at t=0.5
+                p01, p12, p23 = (p0 + p1) / 2, (p1 + p2) / 2, (p2 + p3) / 2
+                p012, p123 = (p01 + p12) / 2, (p12 + p23) / 2
+                mid = (p012 + p123) / 2
+                stack.append((mid, p123, p23, p3, depth + 1))
+                stack.append((p0, p01, p012, mid, depth + 1))
+
+    points = _merge_collinear(points, flatness)
+    return np.array([(p.real, p.imag) for p in points], dtype=np.float64)
+
+
+def _distance_to_chord(pt: complex, start: complex, end: complex):
+    chord = end - start
+    length = abs(chord)
+    if length == 0:
+        return abs(pt - start)
+    # imaginary part of conj(chord) * offset is the cross product
+    return abs((chord.conjugate() * (pt - start)).imag) / length
+
+
+def _merge_collinear(points: list[complex], tolerance: float):
+    """
+    Greedily drop points that sit within tolerance of the line between the last
+    kept point and a later one. Corners, like vertical walls, are always kept.
+
+    Each run keeps the sleeve of directions from its anchor that pass within
+    tolerance of every point in it so far, so whether the next point can end
+    the run is a constant time check and long straight runs stay linear.
+    """
+    if len(points) < 3:
+        return points
+
+    merged = [points[0]]
+    anchor = points[0]
+    sleeve = _Sleeve(tolerance)
+    prev = None
+    for pt in points[1:]:
+        if prev is not None and not sleeve.reaches(pt - anchor):
+            # pt can't end the run, so the point before it does
+            anchor = prev
+            merged.append(anchor)
+            sleeve = _Sleeve(tolerance)
+        sleeve.add(pt - anchor)
+        prev = pt
+    merged.append(points[-1])
+    return merged
+
+
+class _Sleeve:
+    """
+    The directions from a run's anchor whose line passes within tolerance of
+    every point added, as an angle range relative to the first point further
+    than tolerance from the anchor.
+    """
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.ref: complex = None
+        self.lo = -math.pi
+        self.hi = math.pi
+        self.far = 0.0  # the distance of the furthest point from the anchor
+
+    def add(self, offset: complex):
+        """Narrow the sleeve to pass near a point, given relative to the anchor."""
+        dist = abs(offset)
+        self.far = max(self.far, dist)
+        if dist <= self.tolerance:
+            return
+        if self.ref is None:
+            self.ref = offset / dist
+        angle = cmath.phase(offset / self.ref)
+        half = math.asin(self.tolerance / dist)
+        self.lo = max(self.lo, angle - half)
+        self.hi = min(self.hi, angle + half)
+
+    def reaches(self, offset: complex):
+        """
+        Whether every point added lies within tolerance of the chord from the
+        anchor to a point, given relative to the anchor.
+        """
+        # points beyond the end of the chord aren't covered by it
+        if abs(offset) < self.far:
+            return False
+        if self.ref is None:
+            # every point is within tolerance of the anchor itself
+            return True
+        return self.lo <= cmath.phase(offset / self.ref) <= self.hi
+
+
 def level_units_to_world(position: Vec2d | float, level_to_world_units: float):
     """
     Convert coordinates in level design space to world relative units. This
@@ -109,6 +332,7 @@ def load_level_geometry_from_svg(
     level_units_to_world: float,
     samples_per_world_unit: float,
     friction: float,
+    tolerance: float | None = None,
 ):
     """
     Load an SVG and sample it into world relative coordiantes. It then adds
@@ -123,16 +347,177 @@ def load_level_geometry_from_svg(
             The target approximate distance for each sampled point in world
             relative units.
         friction: The friction coefficient of the terrain geometry.
+        tolerance:
+            (world units) If set, tessellate adaptively to this chord error
+            instead of using samples_per_world_unit.
+
+    Returns:
+        The raw sampled points as an (N, 2) array of world relative coordinates.
+    """
+    points = load_level_points(
+        filepath, level_units_to_world, samples_per_world_unit, tolerance
+    )
+    # add points to physcics Space
+    space.add(*create_terrain_segments(space.static_body, points, friction))
+    return points
+
+
+def create_terrain_segments(
+    body: Body,
+    points: np.ndarray,
+    friction: float | np.ndarray,
+    colors: list[tuple[int, int, int, int]] | None = None,
+):
+    """
+    Create the static physics segments joining each consecutive terrain point.
+
+    Args:
+        body: The body to attach the segments to, usually space.static_body.
+        points: The (N, 2) array of world relative terrain points.
+        friction:
+            The friction coefficient of the terrain geometry, or an array of
+            one per segment.
+        colors: Optionally, the RGBA render color of each segment.
+
+    Returns:
+        The N-1 segments, not yet added to any space.
+    """
+    segments = []
+    coords = np.asarray(points).tolist()
+    frictions = np.broadcast_to(friction, len(coords) - 1).tolist()
+    for i, (p1, p2) in enumerate(zip(coords, coords[1:])):
+        seg = Segment(body, p1, p2, TERRAIN_SEGMENT_RADIUS)
+        seg.friction = frictions[i]
+        if colors is not None:
+            seg.color = colors[i]
+        segments.append(seg)
+    return segments
+
+
+def terrain_cache_path(
+    filepath: str,
+    level_to_world_units: float,
+    samples_per_world_unit: float,
+    tolerance: float | None = None,
+    cache_dir: Path = TERRAIN_CACHE_DIR,
+):
+    """
+    Build the compiled terrain cache path for a level. Entries are named
+    <level stem>-<parameters hash>-<key>, where the key is a hash of the SVG
+    file contents and the sampling parameters, so editing the level or its
+    config automatically produces a new entry. Entries of the same level and
+    parameters share everything but the key.
+
+    Args:
+        filepath: The SVG file the terrain is sampled from.
+        level_to_world_units: The number of level units per world unit.
+        samples_per_world_unit: The sampling density in world units.
+        tolerance: The adaptive tessellation tolerance, if used.
+        cache_dir: The directory holding compiled terrain files.
 
     Returns:
-        The raw sampled points as world relative coordinates.
+        The path of the cache entry for these inputs.
     """
+    params = f"|{level_to_world_units!r}|{samples_per_world_unit!r}|{tolerance!r}"
+    level_key = f"{Path(filepath).stem}-{hashlib.sha1(params.encode()).hexdigest()[:8]}"
+    digest = hashlib.sha1()
+    digest.update(f"v{TERRAIN_CACHE_VERSION}".encode())
+    digest.update(Path(filepath).read_bytes())
+    digest.update(params.encode())
+    return Path(cache_dir) / f"{level_key}-{digest.hexdigest()[:16]}.npy"
+
+
+def load_level_points(
+    filepath: str,
+    level_to_world_units: float,
+    samples_per_world_unit: float,
+    tolerance: float | None = None,
+    cache_dir: Path | None = TERRAIN_CACHE_DIR,
+):
+    """
+    Load the sampled terrain points for a level, using the compiled terrain
+    cache when possible. A cache hit memory-maps the packed points and skips
+    XML parsing and curve sampling completely. Missing, stale or corrupt
+    entries are rebuilt from the SVG and written back.
+
+    Args:
+        filepath: The SVG file to load.
+        level_to_world_units:
+            The number of level document relative units per world unit.
+        samples_per_world_unit:
+            The target number of samples per world unit along curves.
+        tolerance:
+            (world units) If set, tessellate adaptively to this chord error
+            instead of sampling at a fixed density.
+        cache_dir: The cache directory, or None to disable caching.
+
+    Returns:
+        An (N, 2) float64 array of world relative terrain points.
+    """
+    if cache_dir is None:
+        return _sample_level_points(
+            filepath, level_to_world_units, samples_per_world_unit, tolerance
+        )
+
+    cache_path = terrain_cache_path(
+        filepath, level_to_world_units, samples_per_world_unit, tolerance, cache_dir
+    )
+    points = _read_terrain_cache(cache_path)
+    if points is None:
+        points = _sample_level_points(
+            filepath, level_to_world_units, samples_per_world_unit, tolerance
+        )
+        _write_terrain_cache(cache_path, points)
+    return points
+
+
+def _sample_level_points(
+    filepath: str,
+    level_to_world_units: float,
+    samples_per_world_unit: float,
+    tolerance: float | None,
+):
     paths = load_svg(filepath)
+    if tolerance is not None:
+        return tessellate_paths_array(paths, level_to_world_units, tolerance)
     # load the SVG and lerp the points based on samples_per_world_unit
-    points = sample_paths(paths, level_units_to_world, samples_per_world_unit)
-    # add points to physcics Space
-    for p1, p2 in zip(points, points[1:]):
-        seg = Segment(space.static_body, p1, p2, 0.2)
-        seg.friction = friction
-        space.add(seg)
+    return sample_paths_array(paths, level_to_world_units, samples_per_world_unit)
+
+
+def _read_terrain_cache(cache_path: Path):
+    if not cache_path.exists():
+        return None
+    try:
+        points = np.load(cache_path, mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError, EOFError):
+        return None
+    if (
+        points.dtype != np.float64
+        or points.ndim != 2
+        or points.shape[0] < 2
+        or points.shape[1] != 2
+        or not np.isfinite(points).all()
+    ):
+        return None
     return points
+
+
+def _write_terrain_cache(cache_path: Path, points: np.ndarray):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # drop stale entries compiled from older versions of the same level and
+        # parameters, other levels' stems can start with this one's
+        level_key = cache_path.stem.rsplit("-", 1)[0]
+        entry = re.compile(re.escape(level_key) + r"-[0-9a-f]{16}")
+        for stale in cache_path.parent.glob(f"{glob.escape(level_key)}-*.npy"):
+            if stale != cache_path and entry.fullmatch(stale.stem):
+                stale.unlink(missing_ok=True)
+        # a unique temp file, sweep workers can build the same entry at once
+        with tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            np.save(f, points, allow_pickle=False)
+        os.replace(f.name, cache_path)
+    except OSError:
+        # the cache is only an optimization, a read-only disk shouldn't stop the game
+        pass
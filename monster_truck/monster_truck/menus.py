@@ -1,8 +1,11 @@
+import functools
+
 import pygame
 from pygame import Surface
 from pygame.event import Event
 from pygame.font import Font
 
+from monster_truck.assets import ASSETS
 from monster_truck.config import *
 from monster_truck.game import Game
 from monster_truck.rendering_utils import print_time
@@ -11,6 +14,45 @@ from monster_truck.rendering_utils import print_time
 MENU_BG_COLOR = (220, 247, 247)
 MENU_FONT_COLOR = (125, 97, 95)
 
+# everything the menus draw, loaded before the main menu shows
+MENU_IMAGES = [
+    "assets/menus/title.png",
+    "assets/menus/play.png",
+    "assets/menus/quit.png",
+    "assets/menus/selector.png",
+    "assets/menus/select_level.png",
+    "assets/menus/level_1.png",
+    "assets/menus/level_2.png",
+]
+
+
+def load_menu_assets():
+    for path in MENU_IMAGES:
+        ASSETS.image(path)
+
+
+@functools.cache
+def splash_font():
+    """pygame's bundled font, which loads without scanning the system fonts."""
+    return pygame.font.Font(None, 48)
+
+
+def draw_progress_bar(screen: Surface, progress: float, center: tuple[int, int]):
+    bar = pygame.Rect(0, 0, 600, 20)
+    bar.center = center
+    pygame.draw.rect(screen, MENU_FONT_COLOR, bar, width=2)
+    fill = bar.inflate(-8, -8)
+    fill.width = round(fill.width * min(max(progress, 0.0), 1.0))
+    pygame.draw.rect(screen, MENU_FONT_COLOR, fill)
+
+
+def splash_screen(screen: Surface):
+    """The first frame shown, drawn before anything else is loaded."""
+    screen.fill(MENU_BG_COLOR)
+    text = splash_font().render("Monster Trucks!", True, MENU_FONT_COLOR)
+    screen.blit(text, text.get_rect(center=(SCREEN_W // 2, SCREEN_H // 2)))
+    pygame.display.flip()
+
 
 class MainMenu:
     bg_color = MENU_BG_COLOR
@@ -18,14 +60,18 @@ class MainMenu:
 
     def __init__(self, screen: Surface):
         self.screen = screen
-        self.logo = pygame.image.load("assets/menus/title.png").convert_alpha()
-        self.play = pygame.image.load("assets/menus/play.png").convert_alpha()
-        self.quit = pygame.image.load("assets/menus/quit.png").convert_alpha()
-        self.selector = pygame.image.load("assets/menus/selector.png").convert_alpha()
+        self.logo = ASSETS.image("assets/menus/title.png")
+        self.play = ASSETS.image("assets/menus/play.png")
+        self.quit = ASSETS.image("assets/menus/quit.png")
+        self.selector = ASSETS.image("assets/menus/selector.png")
         self.items = 2
         self.index = 0
 
-    def step(self, events: Event, dt: float):
+    def step(self, events: Event, dt: float, progress: float = 1.0):
+        """
+        Args:
+            progress: The game's background loading progress, shown until 1.
+        """
         self.screen.fill(self.bg_color)
         menu_item_rects = [
             self.play.get_rect(center=(SCREEN_W // 2, 400)),
@@ -42,6 +88,8 @@ class MainMenu:
             menu_item_rects[self.index].centery,
         )
         self.screen.blit(self.selector, selector_rect)
+        if progress < 1.0:
+            draw_progress_bar(self.screen, progress, (SCREEN_W // 2, SCREEN_H - 100))
 
         pygame.display.flip()
 
@@ -66,10 +114,10 @@ class LevelSelectMenu:
 
     def __init__(self, screen: Surface):
         self.screen = screen
-        self.title = pygame.image.load("assets/menus/select_level.png").convert_alpha()
-        self.level_1 = pygame.image.load("assets/menus/level_1.png").convert_alpha()
-        self.level_2 = pygame.image.load("assets/menus/level_2.png").convert_alpha()
-        self.selector = pygame.image.load("assets/menus/selector.png").convert_alpha()
+        self.title = ASSETS.image("assets/menus/select_level.png")
+        self.level_1 = ASSETS.image("assets/menus/level_1.png")
+        self.level_2 = ASSETS.image("assets/menus/level_2.png")
+        self.selector = ASSETS.image("assets/menus/selector.png")
         self.items = 2
         self.index = 0
 
@@ -100,7 +148,9 @@ class LevelSelectMenu:
                 elif e.key == pygame.K_DOWN:
                     self.index = (self.index + 1) % self.items
                 elif e.key == pygame.K_RETURN:
-                    game.level_config = load_level_config(self.index)
+                    game.select_level(load_level_config(self.index))
+                    if not game.is_level_ready():
+                        return MENU_STATE.LOADING
                     return MENU_STATE.START_GAME
                 elif e.key == pygame.K_ESCAPE:
                     return MENU_STATE.MAIN_MENU
@@ -126,13 +176,38 @@ def game_over(screen: Surface, events: list[Event], font: Font, game: Game):
     for e in events:
         if e.type == pygame.KEYDOWN:
             if e.key == pygame.K_SPACE:
-                return MENU_STATE.START_GAME
+                return MENU_STATE.RESTART_GAME
             if e.key == pygame.K_ESCAPE:
                 return MENU_STATE.MAIN_MENU
 
     return MENU_STATE.GAME_OVER
 
 
+def loading_screen(screen: Surface, events: list[Event], game: Game):
+    if game.is_level_ready():
+        return MENU_STATE.START_GAME
+
+    # the game's fonts may still be loading, draw with the splash font
+    screen.fill(MENU_BG_COLOR)
+    dots = "." * (pygame.time.get_ticks() // 300 % 4)
+    text = splash_font().render(
+        f"Loading {game.level_config.name}{dots}", True, MENU_FONT_COLOR
+    )
+    text_rect = text.get_rect(midleft=(SCREEN_W // 2 - 160, SCREEN_H // 2))
+    screen.blit(text, text_rect)
+    draw_progress_bar(
+        screen, game.loading_progress(), (SCREEN_W // 2, SCREEN_H // 2 + 60)
+    )
+    pygame.display.flip()
+
+    for e in events:
+        if e.type == pygame.KEYDOWN:
+            if e.key == pygame.K_ESCAPE:
+                return MENU_STATE.LEVEL_SELECT
+
+    return MENU_STATE.LOADING
+
+
 def pause_screen(screen: Surface, events: list[Event], font: Font):
     screen.fill(MENU_BG_COLOR)
     text = font.render(
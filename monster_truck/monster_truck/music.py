@@ -1,62 +1,93 @@
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import pygame
 
+MUSIC_EXTENSIONS = {".ogg", ".wav", ".mp3", ".flac"}
+
 
 class Music:
+    """
+    Shuffled soundtrack playback with crossfades between tracks. Tracks are
+    decoded on a background thread one ahead of the one playing, so at most
+    the current and next tracks are ever held in memory, and startup doesn't
+    wait on decoding the whole soundtrack.
+
+    With no music directory, or no playable tracks in it, the music is
+    silent and every method is a no-op.
+    """
+
     music_dir = Path("assets/music")
     auto_fade = 5.0  # seconds
     skip_fade = 2.0  # seconds
     volume = 0.7
 
-    def __init__(self):
-        self.tracks = [s for s in self.music_dir.iterdir()]
+    def __init__(self, music_dir: str | Path | None = None):
+        music_dir = Path(music_dir) if music_dir is not None else self.music_dir
+        self.tracks: list[Path] = []
+        if music_dir.is_dir():
+            self.tracks = [
+                t for t in music_dir.iterdir() if t.suffix.lower() in MUSIC_EXTENSIONS
+            ]
         random.shuffle(self.tracks)
-        self.sounds = [pygame.mixer.Sound(t) for t in self.tracks]
-        self.lengths = [s.get_length() for s in self.sounds]
         self.channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="music-decoder"
+        )
 
         self.active = 0
         self.index = 0
-        self.fading = False
+        self.current: pygame.mixer.Sound = None
+        self._incoming: pygame.mixer.Sound = None
+        self.playing = False
+        self.play_time = 0.0
 
         self.crossfading = False
         self.fade_time = 0.0
         self.fade_elapsed = 0.0
+        self.skip_requested = False
 
-        self.play()
+        # the decode of the track playing next, in the background
+        self._next: Future = None
+        self._next_index = 0
+        if self.tracks:
+            self._queue(0)
 
     def play(self):
         ch = self.channels[self.active]
         ch.set_volume(self.volume)
-        ch.play(self.sounds[self.index])
+        ch.play(self.current)
         self.play_time = 0.0
-
-    def _start_crossfade(self, fade_time):
-        if self.crossfading:
-            return
-
-        next_index = (self.index + 1) % len(self.sounds)
-        next_ch = self.channels[1 - self.active]
-
-        next_ch.set_volume(0.0)
-        next_ch.play(self.sounds[next_index])
-
-        self.crossfading = True
-        self.fade_time = fade_time
-        self.fade_elapsed = 0.0
+        self.playing = True
 
     def next(self):
-        self._start_crossfade(self.skip_fade)
+        """Skip to the next track, as soon as it is decoded."""
+        if self.playing and not self.crossfading:
+            self.skip_requested = True
 
     def step(self, dt):
+        if not self.tracks:
+            return
+
+        if not self.playing:
+            # waiting on the first track
+            sound = self._take_next()
+            if sound is not None:
+                self.index = self._next_index
+                self.current = sound
+                self.play()
+                self._queue(self.index + 1)
+            return
+
         self.play_time += dt
 
-        # auto fade near end
         if not self.crossfading:
-            remaining = self.lengths[self.index] - self.play_time
-            if remaining <= self.auto_fade:
+            remaining = self.current.get_length() - self.play_time
+            if self.skip_requested:
+                self._start_crossfade(self.skip_fade)
+            # auto fade near end
+            elif remaining <= self.auto_fade:
                 self._start_crossfade(self.auto_fade)
 
         # handle crossfade
@@ -73,7 +104,56 @@ class Music:
             if t >= 1.0:
                 out_ch.stop()
                 self.active = 1 - self.active
-                self.index = (self.index + 1) % len(self.sounds)
+                self.index = self._next_index
+                self.current = self._incoming
 
                 self.crossfading = False
                 self.play_time = 0.0
+                self._incoming = None
+                # only now is the old track released, decode the one after
+                self._queue(self.index + 1)
+
+    def shutdown(self):
+        """Stop the decoder thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start_crossfade(self, fade_time):
+        incoming = self._take_next()
+        if incoming is None:
+            # the next track isn't decoded yet, try again next frame
+            return
+
+        next_ch = self.channels[1 - self.active]
+        next_ch.set_volume(0.0)
+        next_ch.play(incoming)
+        self._incoming = incoming
+
+        self.skip_requested = False
+        self.crossfading = True
+        self.fade_time = fade_time
+        self.fade_elapsed = 0.0
+
+    def _queue(self, index: int):
+        self._next_index = index % len(self.tracks)
+        self._next = self._executor.submit(
+            pygame.mixer.Sound, self.tracks[self._next_index]
+        )
+
+    def _take_next(self):
+        """The decoded next track if it is ready, otherwise None."""
+        if self._next is None or not self._next.done():
+            return None
+        try:
+            sound = self._next.result()
+        except (pygame.error, OSError):
+            # unplayable, drop it from the rotation and decode the one after
+            self.tracks.pop(self._next_index)
+            if self._next_index < self.index:
+                # the playing track moved down a place
+                self.index -= 1
+            self._next = None
+            if self.tracks:
+                self._queue(self._next_index)
+            return None
+        self._next = None
+        return sound
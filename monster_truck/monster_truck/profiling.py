@@ -0,0 +1,323 @@
+import csv
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+import pygame
+
+from monster_truck.rendering_utils import GlyphAtlas
+
+# Every phase instrumented in run_game and Game.step, in frame order. Time not
+# covered by a phase, mostly the wait in clock.tick, is reported as "other".
+PHASES = (
+    "music",
+    "events",
+    "menu",
+    "physics",
+    "terrain",
+    "truck",
+    "hud",
+    "profiler",
+    "flip",
+    "engine_audio",
+)
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_):
+        elapsed = time.perf_counter() - self.start
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + elapsed
+
+
+_DISABLED = nullcontext()
+
+
+class FrameProfiler:
+    """
+    Times named phases of a frame. Wrap each phase in `with profiler.phase(...)`
+    and call end_frame once per frame to collect the timings. While disabled,
+    phase returns a shared no-op context, so instrumented code costs next to
+    nothing.
+
+    Attributes:
+        frame: (seconds) Time spent in each phase so far this frame.
+        history:
+            (frame_time, phases) for the most recent frames, where frame_time
+            is the time between consecutive end_frame calls.
+        frames: The number of frames recorded since the profiler was created.
+        hitch_threshold: (seconds) Frames slower than this are hitches.
+        hitch_log: Where hitches are written, if anywhere.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        history: int = 240,
+        hitch_threshold: float = 0.05,
+        hitch_log: "HitchLog | None" = None,
+    ):
+        self.frame: dict[str, float] = {}
+        self.history: deque[tuple[float, dict[str, float]]] = deque(maxlen=history)
+        self.frames = 0
+        self.hitch_threshold = hitch_threshold
+        self.hitch_log = hitch_log
+        self._enabled = False
+        self._last_end = None
+        self.enabled = enabled
+
+    @property
+    def enabled(self):
+        """Whether phases are being timed."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool):
+        if enabled and not self._enabled:
+            # don't count the time spent disabled as one long frame
+            self.frame = {}
+            self._last_end = None
+        self._enabled = enabled
+
+    def phase(self, name: str):
+        """A context manager timing a phase of the current frame."""
+        if not self._enabled:
+            return _DISABLED
+        return _Phase(self, name)
+
+    def end_frame(self):
+        """
+        Finish the current frame, recording it in the history and logging it
+        if it was a hitch.
+
+        Returns:
+            (seconds) The time spent in each phase during the frame.
+        """
+        frame, self.frame = self.frame, {}
+        if not self._enabled:
+            return frame
+
+        now = time.perf_counter()
+        if self._last_end is not None:
+            frame_time = now - self._last_end
+            self.history.append((frame_time, frame))
+            self.frames += 1
+            if self.hitch_log is not None and frame_time > self.hitch_threshold:
+                self.hitch_log.write(frame_time, frame)
+        self._last_end = now
+        return frame
+
+    def close(self):
+        """Write out and close the hitch log, if there is one."""
+        if self.hitch_log is not None:
+            self.hitch_log.close()
+
+
+class HitchLog:
+    """
+    Writes hitch frames and their phase breakdown to a CSV file. Rows are
+    buffered and only written every flush_rows hitches and on close, so a
+    hitch doesn't also pay for disk I/O. Once the file grows past max_bytes it
+    is rotated to path.1, path.1 to path.2 and so on, keeping at most
+    `backups` old files.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 1_000_000,
+        backups: int = 3,
+        phases: tuple[str, ...] = PHASES,
+        flush_rows: int = 64,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.phases = phases
+        self.flush_rows = flush_rows
+        self._rows: list[list[str]] = []
+        self._file = None
+        self._writer = None
+
+    def write(self, frame_time: float, phases: dict[str, float]):
+        """
+        Append a hitch.
+
+        Args:
+            frame_time: (seconds) How long the frame took.
+            phases: (seconds) The time spent in each phase during the frame.
+        """
+        ms = [phases.get(name, 0.0) * 1000 for name in self.phases]
+        other = frame_time * 1000 - sum(ms)
+        timestamp = datetime.now().isoformat(timespec="milliseconds")
+        self._rows.append(
+            [timestamp, f"{frame_time * 1000:.3f}"]
+            + [f"{value:.3f}" for value in ms]
+            + [f"{other:.3f}"]
+        )
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered hitches, rotating the file if it grew too big."""
+        if not self._rows:
+            return
+        if self._file is None:
+            self._open()
+        self._writer.writerows(self._rows)
+        self._rows = []
+        self._file.flush()
+
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def close(self):
+        self.flush()
+        self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", newline="")
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            header = ["time", "frame_ms"]
+            header += [f"{name}_ms" for name in self.phases] + ["other_ms"]
+            self._writer.writerow(header)
+
+    def _rotate(self):
+        self._close_file()
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+class ProfilerOverlay:
+    """
+    A rolling frame time graph, one stacked bar per frame coloured by phase.
+    The graph is a retained surface that scrolls along as frames come in, so
+    each new frame only draws its own bar.
+    """
+
+    size = (480, 140)
+    margin = 20
+    bar_width = 2
+    max_ms = 50.0  # frame time at the top of the graph
+    budget_ms = (1000 / 60, 1000 / 30)
+    background = (0, 0, 0, 170)
+    text_color = (255, 255, 255)
+    colors = {
+        "music": (60, 220, 220),
+        "events": (160, 160, 160),
+        "menu": (255, 120, 200),
+        "physics": (90, 160, 255),
+        "terrain": (120, 200, 90),
+        "truck": (255, 200, 60),
+        "hud": (200, 120, 255),
+        "profiler": (120, 120, 120),
+        "flip": (255, 90, 70),
+        "engine_audio": (30, 140, 140),
+        "other": (70, 70, 90),
+    }
+
+    def __init__(self, font: pygame.font.Font, profiler: FrameProfiler):
+        self.profiler = profiler
+        self.atlas = GlyphAtlas(font, self.text_color, "0123456789.ms /")
+        self.graph = pygame.Surface(self.size, pygame.SRCALPHA)
+        self.graph.fill(self.background)
+        self.legend = self._render_legend(font)
+        self._frames_drawn = profiler.frames
+
+    def draw(self, screen: pygame.Surface):
+        history = self.profiler.history
+        new = min(self.profiler.frames - self._frames_drawn, len(history))
+        for i in range(len(history) - new, len(history)):
+            self._push(*history[i])
+        self._frames_drawn = self.profiler.frames
+
+        x = screen.get_width() - self.size[0] - self.margin
+        y = self.margin
+        screen.blit(self.graph, (x, y))
+        for budget in self.budget_ms:
+            line_y = y + self._ms_to_y(budget)
+            pygame.draw.line(
+                screen, self.text_color, (x, line_y), (x + self.size[0] - 1, line_y)
+            )
+
+        if history:
+            times = [frame_time for frame_time, _ in history]
+            last = times[-1] * 1000
+            worst = max(times) * 1000
+            text = f"{last:.1f} ms / {worst:.1f} ms"
+            self.atlas.draw(screen, text, (x + 4, y + 2))
+        legend_x = screen.get_width() - self.legend.get_width() - self.margin
+        screen.blit(self.legend, (legend_x, y + self.size[1] + 4))
+
+    def _push(self, frame_time: float, phases: dict[str, float]):
+        w, h = self.size
+        self.graph.scroll(-self.bar_width, 0)
+        column = pygame.Rect(w - self.bar_width, 0, self.bar_width, h)
+        self.graph.fill(self.background, column)
+
+        bottom = h
+        accounted = 0.0
+        for name in PHASES:
+            seconds = phases.get(name, 0.0)
+            if seconds <= 0.0:
+                continue
+            accounted += seconds
+            bottom = self._fill_bar(bottom, seconds, self.colors[name])
+        self._fill_bar(bottom, frame_time - accounted, self.colors["other"])
+
+    def _fill_bar(self, bottom: int, seconds: float, color):
+        """Stack a segment onto the newest bar, returning its top."""
+        top = max(self._ms_to_y(seconds * 1000 + self._y_to_ms(bottom)), 0)
+        if bottom > top:
+            rect = (self.size[0] - self.bar_width, top, self.bar_width, bottom - top)
+            self.graph.fill(color, rect)
+        return top
+
+    def _ms_to_y(self, ms: float):
+        return round(self.size[1] * (1 - ms / self.max_ms))
+
+    def _y_to_ms(self, y: int):
+        return (1 - y / self.size[1]) * self.max_ms
+
+    def _render_legend(self, font: pygame.font.Font):
+        labels = [
+            (font.render(name, True, self.text_color), color)
+            for name, color in self.colors.items()
+        ]
+        swatch = font.get_height() // 2
+        width = sum(label.get_width() + swatch + 12 for label, _ in labels)
+        legend = pygame.Surface((width, font.get_height()), pygame.SRCALPHA)
+        legend.fill(self.background)
+        x = 0
+        for label, color in labels:
+            legend.fill(color, (x + 2, swatch // 2, swatch, swatch))
+            x += swatch + 6
+            legend.blit(label, (x, 0))
+            x += label.get_width() + 6
+        return legend
@@ -0,0 +1,228 @@
+import hashlib
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from monster_truck.configs.interfaces import LevelConfig, TruckConfig
+from monster_truck.controllers import Controller
+
+RUN_FILE_MAGIC = b"MTRN"
+RUN_FILE_VERSION = 1
+_HEADER = struct.Struct("<4sBH8s8s?I")
+
+# Each physics step's inputs are packed into one byte: the direction + 1 in the
+# low two bits, then the brake, then whether the truck was reset before the step.
+_DIRECTION_MASK = 0b0011
+_BRAKE = 0b0100
+_RESET = 0b1000
+
+
+def config_hash(config: LevelConfig | TruckConfig):
+    """
+    A short fingerprint of a config, to catch replays against changed configs.
+    A level's fingerprint covers its SVG file too, so editing the level's
+    geometry invalidates its runs and ghosts.
+    """
+    digest = hashlib.sha256(repr(config).encode())
+    if isinstance(config, LevelConfig):
+        digest.update(Path(config.svg_path).read_bytes())
+    return digest.digest()[:8]
+
+
+def _encode(direction: int, braking: bool, reset: bool):
+    return (direction + 1) | (_BRAKE if braking else 0) | (_RESET if reset else 0)
+
+
+def _decode(code: int):
+    return (code & _DIRECTION_MASK) - 1, bool(code & _BRAKE), bool(code & _RESET)
+
+
+@dataclass
+class RunRecording:
+    """
+    The driver inputs for every physics step of one run. The simulation is
+    deterministic, so replaying the inputs through the same level, truck and
+    physics rate reproduces the run exactly.
+
+    Run files are a fixed header followed by the inputs run-length encoded as
+    (count, input) pairs, so held inputs take a few bytes however long they
+    are held.
+
+    Attributes:
+        level: The name of the level the run was driven on.
+        truck: The name of the truck that was driven.
+        level_hash: Fingerprint of the level config, see config_hash.
+        truck_hash: Fingerprint of the truck config, see config_hash.
+        physics_hz: The fixed physics rate the run was simulated at.
+        inputs: One packed input byte per physics step.
+        completed: Whether the run crossed the finish line.
+    """
+
+    level: str
+    truck: str
+    level_hash: bytes
+    truck_hash: bytes
+    physics_hz: int
+    inputs: bytearray = field(default_factory=bytearray)
+    completed: bool = False
+
+    @classmethod
+    def start(
+        cls,
+        level: LevelConfig,
+        truck: TruckConfig,
+        physics_hz: int,
+        level_hash: bytes | None = None,
+    ):
+        """
+        Begin an empty recording of a run.
+
+        Args:
+            level: The level being driven.
+            truck: The truck being driven.
+            physics_hz: The fixed physics rate.
+            level_hash: The level's config_hash, if already known.
+        """
+        return cls(
+            level.name,
+            truck.name,
+            level_hash or config_hash(level),
+            config_hash(truck),
+            physics_hz,
+        )
+
+    def __len__(self):
+        return len(self.inputs)
+
+    @property
+    def duration(self):
+        """(seconds) Simulated length of the run."""
+        return len(self.inputs) / self.physics_hz
+
+    def append(self, direction: int, braking: bool, reset: bool = False):
+        """
+        Record the inputs for the next physics step.
+
+        Args:
+            direction: -1 (forward), 0 or 1 (reverse).
+            braking: Whether the brake was held.
+            reset: Whether the truck was reset to a checkpoint before the step.
+        """
+        self.inputs.append(_encode(direction, braking, reset))
+
+    def step(self, i: int):
+        """The (direction, braking, reset) inputs of physics step i."""
+        return _decode(self.inputs[i])
+
+    def check(self, level: LevelConfig, truck: TruckConfig, physics_hz: int):
+        """
+        Make sure the run can be reproduced with the given configs.
+
+        Raises:
+            ValueError: If the level, truck or physics rate don't match.
+        """
+        if level.name != self.level or config_hash(level) != self.level_hash:
+            raise ValueError(f"Run was recorded on a different '{self.level}' level")
+        if truck.name != self.truck or config_hash(truck) != self.truck_hash:
+            raise ValueError(f"Run was recorded with a different '{self.truck}' truck")
+        if physics_hz != self.physics_hz:
+            raise ValueError(
+                f"Run was recorded at {self.physics_hz} Hz, not {physics_hz} Hz"
+            )
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        codes = np.frombuffer(bytes(self.inputs), dtype=np.uint8)
+        starts = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], starts)) if len(codes) else starts
+        counts = np.diff(np.append(starts, len(codes)))
+
+        with open(path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    RUN_FILE_MAGIC,
+                    RUN_FILE_VERSION,
+                    self.physics_hz,
+                    self.level_hash,
+                    self.truck_hash,
+                    self.completed,
+                    len(counts),
+                )
+            )
+            for name in (self.level, self.truck):
+                encoded = name.encode()
+                f.write(struct.pack("<H", len(encoded)) + encoded)
+            f.write(counts.astype("<u4").tobytes())
+            f.write(codes[starts].tobytes())
+
+    @classmethod
+    def load(cls, path: str | Path):
+        """
+        Read a run file.
+
+        Raises:
+            ValueError: If the file is not a run file this version can read.
+        """
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a run file")
+        magic, version, physics_hz, level_hash, truck_hash, completed, runs = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != RUN_FILE_MAGIC:
+            raise ValueError(f"{path} is not a run file")
+        if version != RUN_FILE_VERSION:
+            raise ValueError(f"{path} is run file version {version}")
+
+        offset = _HEADER.size
+        names = []
+        for _ in range(2):
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            names.append(data[offset : offset + length].decode())
+            offset += length
+
+        counts = np.frombuffer(data, dtype="<u4", count=runs, offset=offset)
+        offset += counts.nbytes
+        codes = np.frombuffer(data, dtype=np.uint8, count=runs, offset=offset)
+        inputs = bytearray(np.repeat(codes, counts).tobytes())
+
+        return cls(
+            names[0],
+            names[1],
+            level_hash,
+            truck_hash,
+            physics_hz,
+            inputs,
+            completed,
+        )
+
+
+class ReplayController(Controller):
+    """
+    Plays back a recorded run one physics step at a time, including any
+    checkpoint resets. Once the recording runs out no input is applied.
+    """
+
+    def __init__(self, recording: RunRecording):
+        self.recording = recording
+        self.step = 0
+
+    @property
+    def finished(self):
+        """Whether every recorded step has been played back."""
+        return self.step >= len(self.recording)
+
+    def should_reset(self):
+        return not self.finished and self.recording.step(self.step)[2]
+
+    def read(self, level_time: float):
+        if self.finished:
+            return 0, False
+        direction, braking, _ = self.recording.step(self.step)
+        self.step += 1
+        return direction, braking
@@ -1,7 +1,12 @@
 import math
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 import pymunk
+from monster_truck.assets import ASSETS, GLOBAL_SCOPE
 from monster_truck.config import *
+from monster_truck.terrain import Terrain
 
 
 def print_time(t: float):
@@ -19,14 +24,23 @@ class SpriteRenderable:
         is_world_texture: bool = False,
         world_pos: pymunk.Vec2d = None,
         tile: bool = False,
+        angle_step: float = 1.0,
+        cache_max_bytes: int = 16 * 1024 * 1024,
+        tile_size_m: pymunk.Vec2d = None,
+        parallax: float = 1.0,
     ):
         """
         sprite: pygame.Surface
         size_m: size in world meters (width, height)
         body: optional physics body to follow
         is_world_texture: True if this is a world-level texture, not a body sprite
-        world_pos: position in world meters (used for world textures)
+        world_pos: top left position in world meters (used for world textures)
         tile: if True, tile the texture to fill world size
+        angle_step: degrees to quantize body rotations to for the rotation cache
+        cache_max_bytes: memory cap for cached rotated surfaces
+        tile_size_m: size in world meters of one tile, defaults to size_m
+        parallax: world texture scroll factor, 1 moves with the world, 0 is
+            fixed to the screen, and values between are distant layers
         """
         self.sprite = sprite
         self.size_m = size_m
@@ -34,15 +48,96 @@ class SpriteRenderable:
         self.is_world_texture = is_world_texture
         self.world_pos = world_pos or pymunk.Vec2d(0, 0)
         self.tile = tile
+        self.tile_size_m = tile_size_m or size_m
+        self.parallax = parallax
+
+        # world textures are scaled once per zoom level
+        self._scaled: pygame.Surface = None
+        self._scaled_for: float = None
+
+        # LRU of rotozoomed sprites keyed by (quantized angle, scale)
+        self.angle_step = angle_step
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._rotations: OrderedDict[tuple[float, float], pygame.Surface] = (
+            OrderedDict()
+        )
+        self._rotations_bytes = 0
 
-        if not is_world_texture and body is not None:
+        if not is_world_texture:
             # Compute pixels per meter from sprite size and world size
             self.sprite_px_per_meter = sprite.get_width() / size_m.x
 
+    def rotated(self, angle_deg: float, scale: float):
+        """
+        Get the sprite rotated and scaled, reusing a cached surface when one
+        was made for the same quantized angle and scale.
+
+        Args:
+            angle_deg: The rotation in degrees.
+            scale: The zoom factor to apply to the sprite.
+
+        Returns:
+            The rotated and scaled surface.
+        """
+        # wrap the quantized angle itself, steps needn't divide 360
+        angle = round(round(angle_deg / self.angle_step) * self.angle_step % 360, 6)
+        key = (angle, round(scale, 4))
+        img = self._rotations.get(key)
+        if img is not None:
+            self._rotations.move_to_end(key)
+            self.cache_hits += 1
+            return img
+
+        self.cache_misses += 1
+        img = pygame.transform.rotozoom(self.sprite, angle, scale)
+        self._rotations[key] = img
+        self._rotations_bytes += _surface_bytes(img)
+        while self._rotations_bytes > self.cache_max_bytes and len(self._rotations) > 1:
+            _, evicted = self._rotations.popitem(last=False)
+            self._rotations_bytes -= _surface_bytes(evicted)
+        return img
+
+    def scaled_texture(self, scale: float):
+        """
+        Get the world texture scaled to screen pixels, rescaling only when the
+        zoom changes.
+
+        Args:
+            scale: Screen pixels per world meter.
+
+        Returns:
+            One tile of the texture, or the whole texture if not tiled.
+        """
+        if scale != self._scaled_for:
+            size = self.tile_size_m if self.tile else self.size_m
+            self._scaled = pygame.transform.smoothscale(
+                self.sprite,
+                (max(1, int(size.x * scale)), max(1, int(size.y * scale))),
+            )
+            self._scaled_for = scale
+        return self._scaled
+
+    def cache_stats(self):
+        """The rotation cache hit/miss counts, size and memory use."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "entries": len(self._rotations),
+            "bytes": self._rotations_bytes,
+        }
+
+
+def _surface_bytes(surf: pygame.Surface):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
 
 def load_sprite_for_body(body: pymunk.Body, path: str, size_m: pymunk.Vec2d):
-    """Load a sprite attached to a physics body."""
-    sprite = pygame.image.load(path).convert_alpha()
+    """Load a sprite attached to a physics body, shared with other bodies."""
+    sprite = ASSETS.image(path)
     return SpriteRenderable(sprite, size_m, body=body, is_world_texture=False)
 
 
@@ -51,14 +146,20 @@ def load_level_texture(
     world_size: pymunk.Vec2d,
     world_pos: pymunk.Vec2d = None,
     tile: bool = False,
+    tile_size: pymunk.Vec2d = None,
+    parallax: float = 1.0,
+    scope: str = GLOBAL_SCOPE,
 ):
     """
     Load a world-level texture, sized in world meters.
     world_size: desired size in world meters
-    world_pos: optional position in world coordinates
+    world_pos: optional top left position in world coordinates
     tile: repeat texture to fill the area
+    tile_size: size of one repeat of the texture in world meters
+    parallax: scroll factor relative to the world, for background layers
+    scope: asset scope to load the image into, see AssetManager
     """
-    sprite = pygame.image.load(path).convert_alpha()
+    sprite = ASSETS.image(path, scope)
     return SpriteRenderable(
         sprite,
         world_size,
@@ -66,9 +167,54 @@ def load_level_texture(
         is_world_texture=True,
         world_pos=world_pos,
         tile=tile,
+        tile_size_m=tile_size,
+        parallax=parallax,
     )
 
 
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs for text that changes often, like numbers. Drawing a
+    string is then a blit per character instead of a trip through the font
+    rasterizer. Characters outside the atlas are rendered and added the first
+    time they are used.
+    """
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        color: tuple[int, int, int],
+        chars: str = "0123456789:.-",
+    ):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+
+    def glyph(self, char: str):
+        if char not in self.glyphs:
+            self.glyphs[char] = self.font.render(char, True, self.color)
+        return self.glyphs[char]
+
+    def width(self, text: str):
+        """The width in pixels text will take when drawn."""
+        return sum(self.glyph(c).get_width() for c in text)
+
+    def draw(self, surface: pygame.Surface, text: str, pos: tuple[int, int]):
+        """
+        Draw text with its top left at pos.
+
+        Returns:
+            The x position just after the last glyph.
+        """
+        x, y = pos
+        for c in text:
+            glyph = self.glyph(c)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x
+
+
 class Camera:
     def __init__(
         self,
@@ -90,58 +236,207 @@ class Camera:
     def to_screen_px(self, size_m: float):
         return size_m * self.screen_scale * self.zoom
 
-
-def draw_sprite(screen: pygame.Surface, renderable: SpriteRenderable, camera: Camera):
-    if renderable.is_world_texture:
-        # Scale world meters → screen pixels
-        scale_x = (
-            camera.to_screen_px(renderable.size_m.x) / renderable.sprite.get_width()
-        )
-        scale_y = (
-            camera.to_screen_px(renderable.size_m.y) / renderable.sprite.get_height()
+    def pixel_origin(self, parallax: float = 1.0):
+        """
+        The world pixel position of the top left of the screen, where world
+        pixels are world units scaled by the current zoom with +Y down. A
+        parallax below 1 makes the camera appear to move less, for layers
+        that are further away.
+        """
+        scale = self.screen_scale * self.zoom
+        return (
+            self.base_pos.x * parallax * scale - self.screen_center.x,
+            -self.base_pos.y * parallax * scale - self.screen_center.y,
         )
 
-        # Apply scaling
-        img = pygame.transform.smoothscale(
-            renderable.sprite,
-            (
-                int(renderable.sprite.get_width() * scale_x),
-                int(renderable.sprite.get_height() * scale_y),
-            ),
-        )
 
-        # Position in screen space
-        pos = camera.to_screen_coords(renderable.world_pos)
+def world_to_pixels(
+    world_points: np.ndarray, scale: float, origin: tuple[float, float]
+):
+    """
+    Convert world positions to integer pixels in one vectorized pass, flipping
+    the Y-axis since the physics world is +Y up and pixels are +Y down.
 
-        if renderable.tile:
-            # Tile texture to fill size
-            tile_cols = math.ceil(
-                renderable.size_m.x
-                * camera.screen_scale
-                * camera.zoom
-                / img.get_width()
-            )
-            tile_rows = math.ceil(
-                renderable.size_m.y
-                * camera.screen_scale
-                * camera.zoom
-                / img.get_height()
-            )
-            for i in range(tile_cols):
-                for j in range(tile_rows):
-                    tile_pos = pos + pymunk.Vec2d(
-                        i * img.get_width(), -j * img.get_height()
-                    )
-                    screen.blit(img, img.get_rect(topleft=tile_pos))
-        else:
-            # Draw single texture
-            screen.blit(img, img.get_rect(topleft=pos))
+    Args:
+        world_points: An (N, 2) array of world positions.
+        scale: Pixels per world unit.
+        origin: The world pixel position that maps to pixel (0, 0).
+
+    Returns:
+        An (N, 2) int array of pixel positions.
+    """
+    world_points = np.asarray(world_points, dtype=np.float64)
+    pixels = np.empty_like(world_points)
+    pixels[:, 0] = world_points[:, 0] * scale - origin[0]
+    pixels[:, 1] = -world_points[:, 1] * scale - origin[1]
+    return np.rint(pixels).astype(np.int64)
+
+
+def draw_sprite(
+    screen: pygame.Surface,
+    renderable: SpriteRenderable,
+    camera: Camera,
+    position: pymunk.Vec2d = None,
+    angle: float = None,
+):
+    """
+    Draw a renderable. Body sprites follow their body unless an explicit
+    position and angle (radians) are given, such as an interpolated pose.
+    """
+    if renderable.is_world_texture:
+        draw_world_texture(screen, renderable, camera)
 
     else:
         # Body sprite: scale + rotate
         scale = (camera.screen_scale * camera.zoom) / renderable.sprite_px_per_meter
-        angle_deg = math.degrees(renderable.body.angle) if renderable.body else 0
-        img = pygame.transform.rotozoom(renderable.sprite, angle_deg, scale)
+        if angle is None:
+            angle = renderable.body.angle if renderable.body else 0
+        if position is None:
+            position = renderable.body.position
+        img = renderable.rotated(math.degrees(angle), scale)
 
-        pos = camera.to_screen_coords(renderable.body.position)
+        pos = camera.to_screen_coords(position)
         screen.blit(img, img.get_rect(center=pos))
+
+
+def draw_world_texture(
+    screen: pygame.Surface, renderable: SpriteRenderable, camera: Camera
+):
+    """
+    Draw a world texture, blitting only the tiles that intersect the screen.
+    The scaled tile is cached on the renderable until the zoom changes.
+    """
+    scale = camera.screen_scale * camera.zoom
+    img = renderable.scaled_texture(scale)
+    origin_x, origin_y = camera.pixel_origin(renderable.parallax)
+    area = pygame.Rect(
+        round(renderable.world_pos.x * scale - origin_x),
+        round(-renderable.world_pos.y * scale - origin_y),
+        round(renderable.size_m.x * scale),
+        round(renderable.size_m.y * scale),
+    )
+    visible = area.clip(screen.get_clip())
+    if visible.width == 0 or visible.height == 0:
+        return
+
+    if not renderable.tile:
+        screen.blit(img, area.topleft)
+        return
+
+    tile_w, tile_h = img.get_size()
+    cols = range(
+        (visible.left - area.left) // tile_w,
+        (visible.right - 1 - area.left) // tile_w + 1,
+    )
+    rows = range(
+        (visible.top - area.top) // tile_h,
+        (visible.bottom - 1 - area.top) // tile_h + 1,
+    )
+    # clip the last row and column of tiles to the textured area
+    prev_clip = screen.get_clip()
+    screen.set_clip(visible)
+    for i in cols:
+        for j in rows:
+            screen.blit(img, (area.left + i * tile_w, area.top + j * tile_h))
+    screen.set_clip(prev_clip)
+
+
+def draw_world_layers(
+    screen: pygame.Surface, layers: list[SpriteRenderable], camera: Camera
+):
+    """Draw world textures back to front, furthest (lowest parallax) first."""
+    for layer in sorted(layers, key=lambda layer: layer.parallax):
+        draw_world_texture(screen, layer, camera)
+
+
+class TerrainRenderer:
+    """
+    Draws the ground as a filled polygon, rasterized once per zoom level into
+    fixed-size tiles on a grid in world pixel space. Each frame only the tiles
+    under the viewport are blitted, so the cost depends on the screen size
+    rather than the level length. Tiles entirely above the ground are skipped,
+    and tiles entirely below a single surface are drawn with a plain fill.
+
+    Each run of segments on the same surface is filled as one polygon in its
+    surface's color, so surface zones only add a polygon per zone boundary to
+    the tiles they cross, and nothing once the tiles are cached.
+
+    Attributes:
+        terrain: The terrain to draw, with its surface zones.
+        tile_size: The width and height of each tile in pixels.
+        max_tiles: How many rasterized tiles to keep before evicting the least
+            recently drawn ones.
+    """
+
+    def __init__(
+        self,
+        terrain: Terrain,
+        tile_size: int = 256,
+        max_tiles: int = 160,
+    ):
+        self.terrain = terrain
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._scale = None
+        self._tiles = OrderedDict()
+
+    def draw(self, screen: pygame.Surface, camera: Camera):
+        scale = camera.screen_scale * camera.zoom
+        if scale != self._scale:
+            # tiles are only valid for the zoom they were rasterized at
+            self._tiles.clear()
+            self._scale = scale
+
+        size = self.tile_size
+        left, top = (round(v) for v in camera.pixel_origin())
+        for i in range(left // size, (left + camera.screen_w - 1) // size + 1):
+            for j in range(top // size, (top + camera.screen_h - 1) // size + 1):
+                tile = self._tile(i, j)
+                dest = (i * size - left, j * size - top)
+                if isinstance(tile, tuple):
+                    # solid ground, cached as its color
+                    screen.fill(tile, pygame.Rect(dest, (size, size)))
+                elif tile is not None:
+                    screen.blit(tile, dest)
+
+    def _tile(self, i: int, j: int):
+        key = (i, j)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+        tile = self._render_tile(i, j)
+        self._tiles[key] = tile
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _render_tile(self, i: int, j: int):
+        size, scale = self.tile_size, self._scale
+        idx = self.terrain.segments_in_range(i * size / scale, (i + 1) * size / scale)
+        if len(idx) == 0:
+            return None
+
+        # the contiguous run of the path crossing this tile's columns
+        first, last = idx.min(), idx.max() + 1
+        points = self.terrain.points[first : last + 1]
+        surface = self.terrain.surface[first:last]
+        colors = self.terrain.surfaces.colors
+        tile_top = -j * size / scale
+        tile_bottom = -(j + 1) * size / scale
+        if tile_bottom > points[:, 1].max():
+            return None
+        single_surface = (surface == surface[0]).all()
+        if tile_top < points[:, 1].min() and single_surface:
+            return colors[surface[0]]
+
+        pixels = world_to_pixels(points, scale, (i * size, j * size)).tolist()
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        # one polygon per run of segments on the same surface
+        breaks = np.flatnonzero(np.diff(surface)) + 1
+        for a, b in zip([0, *breaks], [*breaks, len(surface)]):
+            polygon = pixels[a : b + 1]
+            # close the polygon along the bottom of the tile, so it is filled below
+            polygon += [[polygon[-1][0], size + 1], [polygon[0][0], size + 1]]
+            pygame.draw.polygon(surf, colors[surface[a]], polygon)
+        return surf
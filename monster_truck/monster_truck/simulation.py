@@ -0,0 +1,167 @@
+import time
+from dataclasses import dataclass
+
+from monster_truck.config import load_level_config, load_truck_config
+from monster_truck.configs.interfaces import LevelConfig, TruckConfig
+from monster_truck.controllers import Controller
+from monster_truck.game import Game
+from monster_truck.recording import ReplayController, RunRecording
+from monster_truck.truck import Truck
+
+# (seconds) How long both wheels must be off the ground for the next landing
+# to count as a bounce, so suspension chatter over bumps isn't counted.
+MIN_BOUNCE_AIRTIME = 0.1
+
+
+@dataclass
+class RunResult:
+    """
+    The outcome of a headless simulation run.
+
+    Attributes:
+        level: The name of the level that was run.
+        truck: The name of the truck that was run.
+        completed: Whether the truck crossed the finish line.
+        completion_time:
+            (seconds) Simulated time to cross the finish line, or None if the
+            run timed out.
+        sim_time: (seconds) Total simulated time.
+        checkpoints_reached: The index of the last checkpoint passed.
+        flips: Full chassis rotations, in either direction.
+        bounces:
+            Landings after both wheels were off the ground for at least
+            MIN_BOUNCE_AIRTIME. The drop onto the ground after spawning, at
+            the start or after a checkpoint reset, isn't a bounce.
+        steps: The number of physics steps taken.
+        wall_time:
+            (seconds) Real time spent in physics steps, not counting the
+            bounce detection between them.
+    """
+
+    level: str
+    truck: str
+    completed: bool
+    completion_time: float | None
+    sim_time: float
+    checkpoints_reached: int
+    flips: int
+    bounces: int
+    steps: int
+    wall_time: float
+
+    @property
+    def step_cost(self):
+        """(seconds) Mean real time per physics step."""
+        return self.wall_time / self.steps if self.steps else 0.0
+
+
+def run_simulation(
+    level: LevelConfig,
+    truck: TruckConfig,
+    controller: Controller,
+    max_time: float = 300.0,
+    game: Game | None = None,
+    max_steps: int | None = None,
+):
+    """
+    Run a level headless, as fast as the CPU allows, without a display,
+    audio or HUD.
+
+    Args:
+        level: The level to run.
+        truck: The truck to drive.
+        controller: Where the driver inputs come from.
+        max_time: (seconds) Simulated time to give up after.
+        game:
+            An existing headless game to reuse, which saves rebuilding the
+            level when running the same level many times.
+        max_steps: Physics steps to give up after, if any.
+
+    Returns:
+        The run results.
+    """
+    if game is None:
+        game = Game(headless=True)
+    game.controller = controller
+    game.truck_config = truck
+    game.level_config = level
+    game.restart()
+
+    dt = 1 / game.physics_hz
+    min_air_steps = round(MIN_BOUNCE_AIRTIME * game.physics_hz)
+    steps = 0
+    bounces = 0
+    air_steps = 0
+    # the truck spawns in the air, its first landing isn't a bounce
+    landed = False
+    completed = False
+    wall_time = 0.0
+    while not completed and game.level_time < max_time:
+        if max_steps is not None and steps >= max_steps:
+            break
+        resets = game.resets
+        start = time.perf_counter()
+        completed = game.physics_step(dt)
+        wall_time += time.perf_counter() - start
+        steps += 1
+
+        if game.resets != resets:
+            landed = False
+            air_steps = 0
+        if _wheels_grounded(game.truck):
+            if landed and air_steps >= min_air_steps:
+                bounces += 1
+            landed = True
+            air_steps = 0
+        else:
+            air_steps += 1
+
+    return RunResult(
+        level=level.name,
+        truck=truck.name,
+        completed=completed,
+        completion_time=game.level_time if completed else None,
+        sim_time=game.level_time,
+        checkpoints_reached=game.checkpoint_i,
+        flips=game.flips,
+        bounces=bounces,
+        steps=steps,
+        wall_time=wall_time,
+    )
+
+
+def _wheels_grounded(truck: Truck):
+    """Whether either wheel is touching anything."""
+    contacts = []
+    truck.wheel_rear_body.each_arbiter(contacts.append)
+    truck.wheel_front_body.each_arbiter(contacts.append)
+    return bool(contacts)
+
+
+def replay_run(recording: RunRecording, game: Game | None = None):
+    """
+    Replay a recorded run headless, as fast as the CPU allows.
+
+    Args:
+        recording: The run to replay.
+        game: An existing headless game to reuse.
+
+    Returns:
+        The run results, which match the recorded run exactly.
+
+    Raises:
+        ValueError: If the level or truck has changed since the recording.
+    """
+    level = load_level_config(recording.level)
+    truck = load_truck_config(recording.truck)
+    physics_hz = game.physics_hz if game is not None else Game.physics_hz
+    recording.check(level, truck, physics_hz)
+
+    return run_simulation(
+        level,
+        truck,
+        ReplayController(recording),
+        max_time=float("inf"),
+        game=game,
+        max_steps=len(recording),
+    )
@@ -0,0 +1,55 @@
+import pygame
+
+from monster_truck.assets import BackgroundLoader
+from monster_truck.config import *
+from monster_truck.game import Game
+from monster_truck.level_loader import LevelPreloader
+from monster_truck.menus import load_menu_assets, splash_screen
+from monster_truck.music import Music
+
+
+def show_splash():
+    """Open the window and draw the splash screen, the first startup stage."""
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    splash_screen(screen)
+    return screen
+
+
+def start_game(record_dir: str | None = None):
+    """
+    Everything startup does after the splash screen. Only what the main menu
+    needs is loaded before returning. The slow parts of loading the game's own
+    assets, finding the system fonts, decoding the truck's sprites and sounds
+    and preparing every level's terrain, are left running on game.loader, and
+    the music decodes its first track in the background. Fonts are created and
+    sprites converted on the main thread, once game.loader is ready.
+
+    Args:
+        record_dir: Save a run file of every run's inputs here.
+
+    Returns:
+        (game, music)
+    """
+    load_menu_assets()
+
+    # prepare every level's terrain in the background while the menus show
+    preloader = LevelPreloader(LEVELS)
+    game = Game(pygame.time.Clock(), preloader, record_dir=record_dir)
+    game.loader = BackgroundLoader(
+        [
+            _find_fonts,
+            game.preload_truck_assets,
+            preloader.wait,
+        ]
+    )
+    music = Music()
+    return game, music
+
+
+def _find_fonts():
+    # SysFont scans the system fonts the first time it's used, which is most of
+    # creating a font, so the scan is done here, off the main thread
+    return [
+        pygame.font.match_font("Impact"),
+        pygame.font.match_font("Arial", bold=True),
+    ]
@@ -0,0 +1,354 @@
+"""
+Sweep TruckConfig parameters over headless simulations of a level, running
+one simulation per configuration across all cores. Parameters are dotted
+paths into the truck config, given as a list of values or a lo:hi:count
+range. Every combination is run, or with --samples, random configurations
+are drawn from the ranges instead.
+
+From the monster_truck directory:
+
+    python -m monster_truck.sweep --param torque=16000:28000:5 \\
+        --param wheel_rear.suspension.stiffness=50000,70000,90000
+    python -m monster_truck.sweep --samples 40 --sort flips \\
+        --param torque=16000:28000 --param brake_torque=25000:45000
+    python -m monster_truck.sweep --replay runs/<run>.run --param torque=20000,24000
+"""
+
+import argparse
+import csv
+import dataclasses
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from monster_truck.config import load_level_config, load_truck_config
+from monster_truck.configs.interfaces import LevelConfig, TruckConfig
+from monster_truck.controllers import ScriptedController, full_throttle_trace
+from monster_truck.game import Game
+from monster_truck.recording import ReplayController, RunRecording
+from monster_truck.simulation import RunResult, run_simulation
+
+
+@dataclass
+class ParamSpec:
+    """
+    The values to sweep a single truck parameter over.
+
+    Attributes:
+        name: Dotted path into TruckConfig, like wheel_rear.suspension.damping.
+        values: Explicit values to try, drawn from at random when sampling.
+        low: Lower bound of the range, when given as a range.
+        high: Upper bound of the range, when given as a range.
+        count: How many evenly spaced values of the range a grid tries.
+    """
+
+    name: str
+    values: list[float] | None = None
+    low: float | None = None
+    high: float | None = None
+    count: int | None = None
+
+    @classmethod
+    def parse(cls, spec: str):
+        """
+        Parse name=a,b,c (values), name=lo:hi:count or name=lo:hi (range).
+
+        Raises:
+            ValueError: If the spec is malformed.
+        """
+        name, sep, values = spec.partition("=")
+        if not sep or not name or not values:
+            raise ValueError(f"Expected name=values, got '{spec}'")
+        if ":" not in values:
+            return cls(name, values=[float(v) for v in values.split(",")])
+
+        bounds = values.split(":")
+        if len(bounds) not in (2, 3):
+            raise ValueError(f"Expected lo:hi or lo:hi:count, got '{values}'")
+        count = int(bounds[2]) if len(bounds) == 3 else None
+        return cls(name, low=float(bounds[0]), high=float(bounds[1]), count=count)
+
+    def grid(self):
+        """The values a grid sweep tries."""
+        if self.values is not None:
+            return self.values
+        if self.count is None:
+            raise ValueError(f"'{self.name}' needs a count, lo:hi:count, for a grid")
+        return [float(v) for v in np.linspace(self.low, self.high, self.count)]
+
+    def sample(self, rng: random.Random):
+        """A random value for a random sweep."""
+        if self.values is not None:
+            return rng.choice(self.values)
+        return rng.uniform(self.low, self.high)
+
+
+def with_params(config, params: dict[str, float]):
+    """
+    Copy a config with parameters replaced.
+
+    Args:
+        config: The config dataclass to copy, left unchanged.
+        params: New values keyed by dotted attribute path.
+
+    Raises:
+        ValueError: If a path doesn't name a field of the config.
+    """
+    for path, value in params.items():
+        config = _replace_path(config, path.split("."), value)
+    return config
+
+
+def _replace_path(config, path: list[str], value):
+    name = path[0]
+    if not dataclasses.is_dataclass(config) or name not in {
+        f.name for f in dataclasses.fields(config)
+    }:
+        raise ValueError(f"{type(config).__name__} has no field '{name}'")
+    if len(path) > 1:
+        value = _replace_path(getattr(config, name), path[1:], value)
+    return dataclasses.replace(config, **{name: value})
+
+
+def grid_points(specs: list[ParamSpec]):
+    """Every combination of the specs' grid values."""
+    names = [spec.name for spec in specs]
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(spec.grid() for spec in specs))
+    ]
+
+
+def random_points(specs: list[ParamSpec], samples: int, seed: int = 0):
+    """Random combinations drawn from the specs."""
+    rng = random.Random(seed)
+    return [{spec.name: spec.sample(rng) for spec in specs} for _ in range(samples)]
+
+
+@dataclass
+class SweepJob:
+    """One configuration to simulate, sent to a worker process."""
+
+    level: LevelConfig
+    truck: TruckConfig
+    params: dict[str, float]
+    trace: list[tuple[float, int, bool]] | None
+    recording: RunRecording | None
+    max_time: float
+
+
+# each worker process keeps one headless game, so the level is only loaded once
+_worker_game: Game = None
+
+
+def _run_job(job: SweepJob):
+    global _worker_game
+    if _worker_game is None:
+        _worker_game = Game(headless=True)
+
+    # jobs arrive as fresh copies, reuse the loaded level when it's the same
+    level = job.level
+    if _worker_game.loaded_level_config == level:
+        level = _worker_game.loaded_level_config
+
+    if job.recording is not None:
+        controller = ReplayController(job.recording)
+        max_steps = len(job.recording)
+    else:
+        controller = ScriptedController(job.trace)
+        max_steps = None
+
+    return run_simulation(
+        level,
+        with_params(job.truck, job.params),
+        controller,
+        max_time=job.max_time,
+        game=_worker_game,
+        max_steps=max_steps,
+    )
+
+
+def run_sweep(
+    level: LevelConfig,
+    truck: TruckConfig,
+    points: list[dict[str, float]],
+    trace: list[tuple[float, int, bool]] | None = None,
+    recording: RunRecording | None = None,
+    max_time: float = 120.0,
+    workers: int | None = None,
+):
+    """
+    Simulate a level once per truck configuration on a process pool.
+
+    Args:
+        level: The level to run.
+        truck: The truck config the parameters are applied to.
+        points: Parameter values for each configuration, see with_params.
+        trace: The scripted inputs to drive with, full throttle by default.
+        recording: A recorded run to drive with instead of a trace.
+        max_time: (seconds) Simulated time to give up on a run after.
+        workers: Worker processes, one per core by default.
+
+    Returns:
+        (params, result) for each configuration, in the order given.
+    """
+    if trace is None:
+        trace = full_throttle_trace()
+    # fail on bad parameter paths before starting any workers
+    for params in points:
+        with_params(truck, params)
+
+    jobs = [
+        SweepJob(level, truck, params, trace, recording, max_time) for params in points
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_run_job, jobs))
+    return list(zip(points, results))
+
+
+RESULT_COLUMNS = {
+    "completed": lambda r: r.completed,
+    "time": lambda r: r.completion_time,
+    "checkpoints": lambda r: r.checkpoints_reached,
+    "flips": lambda r: r.flips,
+    "bounces": lambda r: r.bounces,
+    "step_us": lambda r: r.step_cost * 1e6,
+}
+
+
+def sort_results(
+    results: list[tuple[dict[str, float], RunResult]],
+    key: str,
+    descending: bool = False,
+):
+    """
+    Sort sweep results by a result column or a parameter name. Runs missing
+    the value, like unfinished runs when sorting by time, always sort last.
+    """
+    if key in RESULT_COLUMNS:
+        column = RESULT_COLUMNS[key]
+        values = [column(result) for _, result in results]
+    else:
+        values = [params.get(key) for params, _ in results]
+
+    present = [(v, row) for v, row in zip(values, results) if v is not None]
+    missing = [row for v, row in zip(values, results) if v is None]
+    present.sort(key=lambda item: item[0], reverse=descending)
+    return [row for _, row in present] + missing
+
+
+def _format(value):
+    if value is None:
+        return "-"
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float):
+        return f"{value:.3f}" if abs(value) < 1000 else f"{value:.0f}"
+    return str(value)
+
+
+def print_table(results: list[tuple[dict[str, float], RunResult]]):
+    if not results:
+        return
+    param_names = list(results[0][0])
+    header = param_names + list(RESULT_COLUMNS)
+    rows = [
+        [_format(params[name]) for name in param_names]
+        + [_format(column(result)) for column in RESULT_COLUMNS.values()]
+        for params, result in results
+    ]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)]
+    print("  ".join(h.rjust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(cell.rjust(w) for cell, w in zip(row, widths)))
+
+
+def write_csv(path: str, results: list[tuple[dict[str, float], RunResult]]):
+    if not results:
+        return
+    param_names = list(results[0][0])
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(param_names + list(RESULT_COLUMNS))
+        for params, result in results:
+            writer.writerow(
+                [params[name] for name in param_names]
+                + [column(result) for column in RESULT_COLUMNS.values()]
+            )
+
+
+def parse_trace(spec: str):
+    """Parse a trace of time:direction[:brake] entries, like 0:-1,3:0:1,4:-1."""
+    trace = []
+    for entry in spec.split(","):
+        fields = entry.split(":")
+        braking = len(fields) > 2 and fields[2] not in ("0", "")
+        trace.append((float(fields[0]), int(fields[1]), braking))
+    return trace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--param",
+        action="append",
+        required=True,
+        help="name=a,b,c or name=lo:hi[:count], a dotted path into TruckConfig",
+    )
+    parser.add_argument("--samples", type=int, help="random configurations to try")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", default="0", help="level index or name")
+    parser.add_argument("--truck", help="truck name, the first truck by default")
+    inputs = parser.add_mutually_exclusive_group()
+    inputs.add_argument("--trace", help="scripted inputs, time:direction[:brake],...")
+    inputs.add_argument("--replay", metavar="RUN", help="drive a recorded run")
+    parser.add_argument("--max-time", type=float, default=120.0)
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument(
+        "--sort", default="time", help="result column or parameter to sort by"
+    )
+    parser.add_argument("--descending", action="store_true")
+    parser.add_argument("--csv", help="path to also write the results to")
+    args = parser.parse_args()
+
+    level = args.level
+    level = load_level_config(int(level) if level.isdigit() else level)
+    truck = load_truck_config(args.truck)
+    recording = None
+    if args.replay:
+        recording = RunRecording.load(args.replay)
+        level = load_level_config(recording.level)
+    trace = parse_trace(args.trace) if args.trace else None
+
+    specs = [ParamSpec.parse(spec) for spec in args.param]
+    if args.samples:
+        points = random_points(specs, args.samples, args.seed)
+    else:
+        points = grid_points(specs)
+
+    print(
+        f"{len(points)} configurations of {truck.name} on {level.name}, "
+        f"{args.workers or os.cpu_count()} workers"
+    )
+    results = run_sweep(
+        level,
+        truck,
+        points,
+        trace=trace,
+        recording=recording,
+        max_time=args.max_time,
+        workers=args.workers,
+    )
+    results = sort_results(results, args.sort, args.descending)
+    print_table(results)
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"\nwrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import math
+
+import numpy as np
+from pymunk import Vec2d, Space, Segment
+
+from monster_truck.configs.interfaces import LevelConfig
+from monster_truck.level_utils import create_terrain_segments, level_units_to_world
+
+
+_NO_SEGMENTS = np.empty(0, dtype=np.int64)
+
+
+class SurfaceIndex:
+    """
+    An interval index of a level's surface zones. Zones are sorted by their
+    start and can't overlap, so finding the surface at an x position is a
+    single bisect. Surface 0 is the default ground outside every zone, and
+    zone k is surface k + 1.
+
+    Attributes:
+        starts: (world units) The sorted start of each zone.
+        ends: (world units) The end of each zone.
+        frictions: The friction coefficient of each surface.
+        colors: The ground fill color of each surface.
+    """
+
+    def __init__(
+        self,
+        zones: list[tuple[float, float, float, tuple[int, int, int]]],
+        default_friction: float,
+        default_color: tuple[int, int, int],
+    ):
+        """
+        Args:
+            zones: (start, end, friction, color) of each zone, in world units.
+            default_friction: The friction coefficient outside every zone.
+            default_color: The ground fill color outside every zone.
+
+        Raises:
+            ValueError: If a zone is empty or zones overlap.
+        """
+        zones = sorted(zones, key=lambda zone: zone[0])
+        for start, end, *_ in zones:
+            if end <= start:
+                raise ValueError(f"Surface zone {start}..{end} is empty.")
+        for (_, end, *_), (start, *_) in zip(zones, zones[1:]):
+            if start < end:
+                raise ValueError(f"Surface zones overlap at x {start}.")
+
+        self.starts = np.array([zone[0] for zone in zones], dtype=np.float64)
+        self.ends = np.array([zone[1] for zone in zones], dtype=np.float64)
+        self.frictions = [default_friction] + [zone[2] for zone in zones]
+        self.colors = [tuple(default_color)] + [tuple(zone[3]) for zone in zones]
+
+    @classmethod
+    def from_level(cls, config: LevelConfig):
+        """Index a level's surface zones, converted to world units."""
+        zones = []
+        for zone in config.surface_zones:
+            start = level_units_to_world(Vec2d(zone.start, 0), config.units_per_meter)
+            end = level_units_to_world(Vec2d(zone.end, 0), config.units_per_meter)
+            zones.append((start.x, end.x, zone.friction, zone.color))
+        return cls(zones, config.ground_friction, config.ground_color)
+
+    @property
+    def bounds(self):
+        """Every x position where the surface can change."""
+        return np.unique(np.concatenate((self.starts, self.ends)))
+
+    def surfaces_at(self, xs: np.ndarray):
+        """The surface at each of an array of x positions."""
+        if len(self.starts) == 0:
+            return np.zeros(len(xs), dtype=np.int64)
+        i = np.searchsorted(self.starts, xs, side="right") - 1
+        inside = (i >= 0) & (xs < self.ends[np.maximum(i, 0)])
+        return np.where(inside, i + 1, 0)
+
+
+class Terrain:
+    """
+    Indexed terrain geometry built from the sampled ground points. Segments are
+    stored in flat arrays and bucketed into fixed-width x cells, so ground
+    queries only look at the handful of segments in the cells around an x
+    position rather than scanning the whole level.
+
+    Every segment lies on a single ground surface. The path is split wherever
+    it crosses a surface zone boundary, and each segment's surface is looked
+    up once, here, so nothing about the surfaces is computed per frame.
+
+    Attributes:
+        points: (N, 2) world relative terrain points, in path order.
+        starts: (N-1, 2) start point of each segment.
+        ends: (N-1, 2) end point of each segment.
+        min_x: Left-most x coordinate of each segment.
+        max_x: Right-most x coordinate of each segment.
+        surfaces: The surface zones the terrain was split by.
+        surface: The surface of each segment, an index into surfaces.
+        frictions: The friction coefficient of each segment.
+    """
+
+    cell_width = 2.0  # world units, the width of the index's x cells
+
+    def __init__(self, points: np.ndarray, surfaces: SurfaceIndex):
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or len(points) < 2:
+            raise ValueError("Terrain needs at least two (x, y) points.")
+        self.points = _split_at(points, surfaces.bounds)
+
+        self.starts = self.points[:-1]
+        self.ends = self.points[1:]
+        self.min_x = np.minimum(self.starts[:, 0], self.ends[:, 0])
+        self.max_x = np.maximum(self.starts[:, 0], self.ends[:, 0])
+
+        # segments don't cross zone boundaries, so their middle decides the zone
+        self.surfaces = surfaces
+        self.surface = surfaces.surfaces_at((self.min_x + self.max_x) / 2)
+        self.frictions = np.asarray(surfaces.frictions)[self.surface]
+
+        # The path can double back on itself (walls, overhangs), so a cell can
+        # hold segments from anywhere along it. Each segment is listed in every
+        # cell it spans, so a query only needs the cells its range covers.
+        first = np.floor(self.min_x / self.cell_width).astype(np.int64)
+        last = np.floor(self.max_x / self.cell_width).astype(np.int64)
+        counts = last - first + 1
+        segments = np.repeat(np.arange(len(first)), counts)
+        # each segment's cells count up from its first one
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        cells = np.repeat(first, counts) + np.arange(counts.sum()) - run_starts
+        order = np.lexsort((segments, cells))
+        keys, starts = np.unique(cells[order], return_index=True)
+        self._cells = dict(zip(keys.tolist(), np.split(segments[order], starts[1:])))
+
+    def __len__(self):
+        """The number of terrain segments."""
+        return len(self.starts)
+
+    @property
+    def bounds(self):
+        """The (left, right) x extent of the terrain."""
+        return float(self.min_x.min()), float(self.max_x.max())
+
+    def segments_in_range(self, x0: float, x1: float):
+        """
+        Find every segment that overlaps the x range [x0, x1].
+
+        Args:
+            x0: The left edge of the range.
+            x1: The right edge of the range.
+
+        Returns:
+            The overlapping segment indices, in path order.
+        """
+        first = math.floor(x0 / self.cell_width)
+        last = math.floor(x1 / self.cell_width)
+        if first == last:
+            # cells list their segments in path order
+            candidates = self._cells.get(first, _NO_SEGMENTS)
+        else:
+            cells = [self._cells.get(i, _NO_SEGMENTS) for i in range(first, last + 1)]
+            candidates = np.unique(np.concatenate(cells))
+        overlap = (self.max_x[candidates] >= x0) & (self.min_x[candidates] <= x1)
+        return candidates[overlap]
+
+    def height_at(self, x: float):
+        """
+        Get the height of the driving surface at an x position. Where the
+        terrain overlaps itself, this is the top-most surface, which is the
+        one a truck dropped from above would land on.
+
+        Args:
+            x: The world x position to query.
+
+        Returns:
+            The ground height in world units.
+        """
+        idx = self._spanning(x)
+        start, end = self.starts[idx], self.ends[idx]
+        dx = end[:, 0] - start[:, 0]
+        vertical = dx == 0
+        # vertical segments (walls) count as their top-most point
+        t = (x - start[:, 0]) / np.where(vertical, 1.0, dx)
+        y = start[:, 1] + t * (end[:, 1] - start[:, 1])
+        y = np.where(vertical, np.maximum(start[:, 1], end[:, 1]), y)
+        return float(y.max())
+
+    def highest_surface_at(self, x: float, half_width: float = 0.0):
+        """
+        Get the highest ground point over an x span, which is where something
+        half_width wide can be placed at x without intersecting the terrain.
+
+        Args:
+            x: The world x position of the center of the span.
+            half_width: Half of the span width in world units.
+
+        Returns:
+            The position at x, raised to the highest ground in the span.
+        """
+        heights = [self.height_at(x)]
+        if half_width > 0:
+            x0, x1 = x - half_width, x + half_width
+            heights += [self.height_at(x0), self.height_at(x1)]
+            # any vertex inside the span can poke above both edges
+            idx = self.segments_in_range(x0, x1)
+            verts = np.concatenate((self.starts[idx], self.ends[idx]))
+            inside = (verts[:, 0] >= x0) & (verts[:, 0] <= x1)
+            if inside.any():
+                heights.append(verts[inside, 1].max())
+        return Vec2d(x, float(max(heights)))
+
+    def segment_colors(self, indices: np.ndarray | None = None):
+        """The RGBA render color of the indexed segments, or of every segment."""
+        surface = self.surface if indices is None else self.surface[indices]
+        return [(*self.surfaces.colors[s], 255) for s in surface]
+
+    def _spanning(self, x: float):
+        idx = self.segments_in_range(x, x)
+        if len(idx) == 0:
+            raise ValueError(
+                f"x-axis position {x} does not intersect with ground plane."
+            )
+        return idx
+
+
+def _split_at(points: np.ndarray, xs: np.ndarray):
+    """Insert a point wherever the path crosses one of the x positions."""
+    for x in xs:
+        starts, ends = points[:-1, 0], points[1:, 0]
+        crossing = np.flatnonzero(
+            ((starts < x) & (ends > x)) | ((starts > x) & (ends < x))
+        )
+        if len(crossing) == 0:
+            continue
+        t = (x - starts[crossing]) / (ends[crossing] - starts[crossing])
+        a, b = points[crossing], points[crossing + 1]
+        split = a + t[:, None] * (b - a)
+        split[:, 0] = x
+        points = np.insert(points, crossing + 1, split, axis=0)
+    return points
+
+
+class TerrainStreamer:
+    """
+    Streams terrain into a physics space in fixed-width x chunks, so only the
+    ground around the truck takes part in the broadphase. Each chunk's segments
+    are created the first time it comes into range and then reused as it is
+    added and removed.
+
+    Attributes:
+        space: The physics space the chunks are streamed into.
+        terrain: The indexed terrain to stream.
+        chunk_width: (world units) The width of each chunk.
+        window:
+            (world units) How far either side of the focus position chunks are
+            kept in the space.
+        active: The indices of the chunks currently in the space.
+    """
+
+    def __init__(
+        self,
+        space: Space,
+        terrain: Terrain,
+        chunk_width: float,
+        window: float,
+    ):
+        self.space = space
+        self.terrain = terrain
+        self.chunk_width = chunk_width
+        self.window = window
+        self.active: set[int] = set()
+
+        # Segments belong to the chunk holding their left edge, so a chunk can
+        # contain segments reaching up to the widest segment to its right.
+        chunk_of = np.floor(terrain.min_x / chunk_width).astype(np.int64)
+        order = np.argsort(chunk_of, kind="stable")
+        keys, starts = np.unique(chunk_of[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self._chunk_segments = {
+            int(key): order[start:end] for key, start, end in zip(keys, starts, ends)
+        }
+        self._reach = float((terrain.max_x - terrain.min_x).max())
+        self._chunks: dict[int, list[Segment]] = {}
+
+    def update(self, x: float):
+        """
+        Add chunks within the window around x, and remove the ones outside it.
+
+        Args:
+            x: The world x position to stream around, usually the truck.
+        """
+        first = math.floor((x - self.window - self._reach) / self.chunk_width)
+        last = math.floor((x + self.window) / self.chunk_width)
+        wanted = {i for i in range(first, last + 1) if i in self._chunk_segments}
+        if wanted == self.active:
+            return
+
+        for i in self.active - wanted:
+            self.space.remove(*self._chunks[i])
+        for i in wanted - self.active:
+            self.space.add(*self._chunk(i))
+        self.active = wanted
+
+    def clear(self):
+        """Remove every streamed chunk from the space."""
+        for i in self.active:
+            self.space.remove(*self._chunks[i])
+        self.active = set()
+
+    @property
+    def segment_count(self):
+        """The number of terrain segments currently in the space."""
+        return sum(len(self._chunk_segments[i]) for i in self.active)
+
+    def _chunk(self, i: int):
+        if i not in self._chunks:
+            # segment j joins terrain points j and j+1
+            terrain = self.terrain
+            self._chunks[i] = [
+                seg
+                for j in self._chunk_segments[i]
+                for seg in create_terrain_segments(
+                    self.space.static_body,
+                    terrain.points[j : j + 2],
+                    terrain.frictions[j],
+                    terrain.segment_colors([j]),
+                )
+            ]
+        return self._chunks[i]
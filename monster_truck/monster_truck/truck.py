@@ -24,33 +24,30 @@ class Truck:
         config: TruckConfig,
         space: pymunk.Space,
         default_position: pymunk.Vec2d = pymunk.Vec2d(0, 0),
+        load_sprites: bool = True,
     ):
         self.config = config
         self.space = space
 
         self.default_position = default_position
+        self.constraints: list[pymunk.Constraint] = []
         self.chassis_body = self._build_chassis(config.chassis)
         self.wheel_rear_body = self._build_wheel(config.wheel_rear)
         self.wheel_front_body = self._build_wheel(config.wheel_front)
+        self._attach()
 
         self.motor = MotorController(config, self.wheel_rear_body, self.chassis_body)
-        space.add(pymunk.GearJoint(self.wheel_rear_body, self.wheel_front_body, 0, 1.0))
 
-        self.chassis_renderable = load_sprite_for_body(
-            self.chassis_body, config.chassis.sprite_path, config.chassis.dimensions
-        )
+        # headless simulations have no display to convert sprites for
+        self.chassis_renderable = None
+        self.wheel_r_renderable = None
+        self.wheel_f_renderable = None
+        if load_sprites:
+            self._load_sprites()
 
-        self.wheel_r_renderable = load_sprite_for_body(
-            self.wheel_rear_body,
-            config.wheel_rear.sprite_path,
-            config.wheel_rear.dimensions,
-        )
-
-        self.wheel_f_renderable = load_sprite_for_body(
-            self.wheel_front_body,
-            config.wheel_front.sprite_path,
-            config.wheel_front.dimensions,
-        )
+        # body poses before the latest physics step, for render interpolation
+        self.prev_poses: dict[pymunk.Body, tuple[pymunk.Vec2d, float]] = {}
+        self.store_pose()
 
     @property
     def bb(self):
@@ -67,10 +64,110 @@ class Truck:
             bottom=min(s.bb.bottom for s in shapes),
         )
 
-    def draw(self, screen: pygame.Surface, camera: Camera):
-        draw_sprite(screen, self.chassis_renderable, camera)
-        draw_sprite(screen, self.wheel_r_renderable, camera)
-        draw_sprite(screen, self.wheel_f_renderable, camera)
+    @property
+    def bodies(self):
+        """The chassis and wheel bodies."""
+        return (self.chassis_body, self.wheel_rear_body, self.wheel_front_body)
+
+    @property
+    def wheel_rpm(self):
+        """The (front, rear) wheel speeds in RPM, positive driving forwards."""
+        rad_to_rpm = 60 / (2 * math.pi)
+        return (
+            -self.wheel_front_body.angular_velocity * rad_to_rpm,
+            -self.wheel_rear_body.angular_velocity * rad_to_rpm,
+        )
+
+    def remove(self):
+        """Remove the truck's bodies, shapes and joints from its space."""
+        shapes = [shape for body in self.bodies for shape in body.shapes]
+        self.space.remove(*self.bodies, *shapes, *self.constraints)
+
+    def reset(self, position: pymunk.Vec2d):
+        """
+        Put the truck back at rest, upright at a new position. The existing
+        bodies, shapes and sprites are reused. The joints are rebuilt, since
+        they carry the solver's cached impulses from the last run, so a reset
+        truck simulates exactly like a newly built one.
+
+        Args:
+            position: The new chassis position in world coordinates.
+        """
+        self.remove()
+        self.default_position = position
+        placements = (
+            (self.chassis_body, pymunk.Vec2d(0, 0)),
+            (self.wheel_rear_body, self.config.wheel_rear.offset),
+            (self.wheel_front_body, self.config.wheel_front.offset),
+        )
+        for body, offset in placements:
+            body.position = position + offset
+            body.angle = 0
+            body.velocity = (0, 0)
+            body.angular_velocity = 0
+            body.force = (0, 0)
+            body.torque = 0
+        self._attach()
+
+        self.motor.update_target(0)
+        self.store_pose()
+
+    def store_pose(self):
+        """Remember the current body poses, call before each physics step."""
+        self.prev_poses = {body: (body.position, body.angle) for body in self.bodies}
+
+    def interpolated_pose(self, body: pymunk.Body, alpha: float):
+        """
+        Blend a body's pose between the previous and the latest physics step.
+
+        Args:
+            body: One of the truck's bodies.
+            alpha: 0 gives the previous pose, 1 the latest.
+
+        Returns:
+            The (position, angle) of the body.
+        """
+        prev_pos, prev_angle = self.prev_poses[body]
+        return (
+            prev_pos + (body.position - prev_pos) * alpha,
+            prev_angle + (body.angle - prev_angle) * alpha,
+        )
+
+    def sprite_cache_stats(self):
+        """Rotation cache stats for each of the truck's sprites."""
+        return {
+            "chassis": self.chassis_renderable.cache_stats(),
+            "wheel_rear": self.wheel_r_renderable.cache_stats(),
+            "wheel_front": self.wheel_f_renderable.cache_stats(),
+        }
+
+    def draw(self, screen: pygame.Surface, camera: Camera, alpha: float = 1.0):
+        for renderable in (
+            self.chassis_renderable,
+            self.wheel_r_renderable,
+            self.wheel_f_renderable,
+        ):
+            position, angle = self.interpolated_pose(renderable.body, alpha)
+            draw_sprite(screen, renderable, camera, position, angle)
+
+    def _load_sprites(self):
+        self.chassis_renderable = load_sprite_for_body(
+            self.chassis_body,
+            self.config.chassis.sprite_path,
+            self.config.chassis.dimensions,
+        )
+
+        self.wheel_r_renderable = load_sprite_for_body(
+            self.wheel_rear_body,
+            self.config.wheel_rear.sprite_path,
+            self.config.wheel_rear.dimensions,
+        )
+
+        self.wheel_f_renderable = load_sprite_for_body(
+            self.wheel_front_body,
+            self.config.wheel_front.sprite_path,
+            self.config.wheel_front.dimensions,
+        )
 
     def _build_chassis(self, config: ChassisConfig):
         chassis_moment = pymunk.moment_for_box(config.mass, config.dimensions)
@@ -81,8 +178,6 @@ class Truck:
         chassis_shape.friction = config.friction
         chassis_shape.filter = pymunk.ShapeFilter(group=Truck.filter_group)
 
-        self.space.add(chassis_body, chassis_shape)
-
         return chassis_body
 
     def _build_wheel(self, config: WheelConfig):
@@ -94,11 +189,27 @@ class Truck:
         wheel_shape.friction = config.friction
         wheel_shape.filter = pymunk.ShapeFilter(group=Truck.filter_group)
 
-        self._add_suspension(config.suspension, wheel_body, config.offset)
-
-        self.space.add(wheel_body, wheel_shape)
         return wheel_body
 
+    def _attach(self):
+        """Add the bodies and shapes to the space with newly built joints."""
+        self.constraints = []
+        self._add_suspension(
+            self.config.wheel_rear.suspension,
+            self.wheel_rear_body,
+            self.config.wheel_rear.offset,
+        )
+        self._add_suspension(
+            self.config.wheel_front.suspension,
+            self.wheel_front_body,
+            self.config.wheel_front.offset,
+        )
+        gear = pymunk.GearJoint(self.wheel_rear_body, self.wheel_front_body, 0, 1.0)
+        self.constraints.append(gear)
+
+        shapes = [shape for body in self.bodies for shape in body.shapes]
+        self.space.add(*self.bodies, *shapes, *self.constraints)
+
     def _add_suspension(
         self,
         config: SuspensionConfig,
@@ -130,7 +241,7 @@ class Truck:
         )
         spring.collide_bodies = False
 
-        self.space.add(groove, spring)
+        self.constraints += [groove, spring]
 
 
 class MotorController: